@@ -0,0 +1,452 @@
+"""
+Módulo de estimativa de custo e controle de admissão de pedidos.
+
+Em vez de limites fixos (máximo de dados, lados ou jogadas), estima o
+tempo e o pico de memória de cada pedido no motor que seria usado e
+compara com um orçamento configurável. O pedido pode ser:
+
+    aceitar  - roda como pedido
+    reduzir  - roda com um motor mais barato (probabilidades aproximadas
+               pela normal quando nem o cálculo exato por convolução cabe
+               e há dados suficientes, ou simulação em blocos com
+               atualização contínua da tela) ou com as somas agrupadas
+               em faixas no gráfico e na tabela
+    rejeitar - o custo excede o orçamento mesmo com os motores mais baratos
+
+As constantes de custo foram medidas no CPython 3.11 e podem ser
+ajustadas para outra máquina com calibrar().
+"""
+
+import math
+import time
+import tracemalloc
+from collections import namedtuple
+
+from dice_logic import (
+    calcular_probabilidades,
+    simular_jogadas,
+    validar_parametros,
+    TAMANHO_BLOCO,
+)
+from dice_rng import criar_gerador, BACKEND_PADRAO
+
+# Estimativa de custo de um motor
+Estimativa = namedtuple("Estimativa", ["segundos", "bytes_pico"])
+
+# Limites aceitos para um pedido
+#   segundos_max: tempo total máximo (cálculo + simulação + exibição)
+#   memoria_max: pico de memória máximo, em bytes
+#   segundos_interativo: acima disso a simulação roda em blocos,
+#       mostrando o progresso na tela
+#   somas_exibidas_max: máximo de barras no gráfico e de linhas na tabela;
+#       acima disso as somas são agrupadas em faixas
+Orcamento = namedtuple(
+    "Orcamento",
+    ["segundos_max", "memoria_max", "segundos_interativo", "somas_exibidas_max"],
+    defaults=[1000],
+)
+
+# Decisão sobre um pedido
+#   acao: "aceitar", "reduzir" ou "rejeitar"
+#   motor_exato: "tabela", "enumeracao", "convolucao" ou "aproximacao"
+#   motor_simulacao: "simulacao" ou "simulacao_em_blocos"
+#   estimativa: custo total estimado (Estimativa)
+#   mensagem: explicação para o usuário ("" quando aceito sem mudanças)
+#   agrupamento: quantidade de somas por barra/linha exibida (1 = sem agrupar)
+Decisao = namedtuple(
+    "Decisao",
+    ["acao", "motor_exato", "motor_simulacao", "estimativa", "mensagem", "agrupamento"],
+    defaults=[1],
+)
+
+ORCAMENTO_PADRAO = Orcamento(
+    segundos_max=60.0,
+    memoria_max=512 * 1024 ** 2,
+    segundos_interativo=0.5,
+    somas_exibidas_max=1000,
+)
+
+# Custos medidos (por dado de cada combinação/jogada)
+CUSTOS = {
+    # calcular_probabilidades: product() + sum() de cada combinação
+    "enumeracao_segundos": 100e-9,
+    # Tupla (56 bytes + 8 por dado) na lista de combinações e a soma na lista de somas
+    "enumeracao_bytes_base": 56,
+    "enumeracao_bytes_dado": 8,
+    # calcular_probabilidades_convolucao, por soma e dado: base e acréscimo
+    # por bit das contagens (inteiros de até num_dados·log2(lados) bits)
+    "convolucao_segundos": 150e-9,
+    "convolucao_segundos_bit": 0.15e-9,
+    # Inteiros vivos por soma durante a convolução (vetor e prefixos)
+    "convolucao_inteiros_soma": 2.5,
+    # calcular_probabilidades_aproximadas, por soma possível
+    "aproximacao_segundos": 1e-6,
+    # Entrada de dicionário/Counter por soma possível
+    "bytes_soma": 100,
+    # Faces sorteadas de um bloco, por dado: a posição na lista (ou no vetor
+    # do NumPy) e a soma da jogada, com faces até 256 (inteiros compartilhados)
+    "bytes_face": 16,
+    # Objeto int de cada face acima de 256 nos backends em Python puro
+    "bytes_inteiro": 32,
+    # Barra do gráfico + linha da tabela (controles do Flet), por soma exibida
+    "exibicao_segundos": 1e-3,
+    "exibicao_bytes": 4096,
+    # Modo de comparação, por execução e coluna da matriz: a linha montada
+    # em adicionar() e a conta de estatisticas()
+    "celula_segundos": 350e-9,
+    # Contagem int64 de cada célula da matriz
+    "bytes_celula": 8,
+    # Por execução: total em _totais, a frequência (float) criada por
+    # estatisticas() para cada coluna e o Counter temporário da execução
+    "bytes_execucao": 80,
+}
+
+# Tempo por dado sorteado em cada backend de dice_rng
+SEGUNDOS_POR_DADO = {
+    "mersenne": 150e-9,
+    "xoshiro": 3.5e-6,
+    "pcg64": 10e-9,
+}
+
+# Tempo fixo de cada execução no modo de comparação: criar o gerador do
+# fluxo (no xoshiro, um salto), simular e guardar o histograma
+SEGUNDOS_POR_EXECUCAO = {
+    "mersenne": 30e-6,
+    "xoshiro": 600e-6,
+    "pcg64": 50e-6,
+}
+
+
+# Abaixo desta quantidade de dados a soma ainda está longe da normal, então
+# a aproximação não é usada: se nem a convolução couber, o pedido é recusado
+DADOS_MIN_APROXIMACAO = 30
+
+# Acima destes valores as estimativas aparecem só como "mais de ..."
+_SEGUNDOS_EXIBIDOS_MAX = 365 * 24 * 3600
+_BYTES_EXIBIDOS_MAX = 1024 ** 5
+
+
+def _quantidade_somas(num_dados, lados):
+    """Quantidade de somas possíveis (de num_dados a num_dados * lados)."""
+    return num_dados * (lados - 1) + 1
+
+
+def _em_float(quantidade):
+    """
+    Converte um inteiro em float para as contas de custo.
+
+    Inteiros grandes demais para um float viram math.inf, ou seja, um
+    custo acima de qualquer orçamento.
+    """
+    try:
+        return float(quantidade)
+    except OverflowError:
+        return math.inf
+
+
+def _combinacoes(num_dados, lados):
+    """
+    lados^num_dados como float, sem calcular a potência inteira exata.
+
+    O expoente é avaliado em logaritmo; se o resultado não couber em um
+    float (cerca de 1e308), devolve math.inf.
+    """
+    if _em_float(num_dados) * math.log2(lados) >= 1000:
+        return math.inf
+    return float(lados ** num_dados)
+
+
+def estimar_custo(motor, num_dados, lados, num_jogadas=0, backend=BACKEND_PADRAO):
+    """
+    Estima tempo e pico de memória de um motor.
+
+    Args:
+        motor: "enumeracao", "convolucao", "aproximacao", "simulacao" ou
+            "simulacao_em_blocos"
+        num_dados: Quantidade de dados
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade de jogadas (apenas para as simulações)
+        backend: Backend de dice_rng usado nas simulações
+
+    Returns:
+        Estimativa(segundos, bytes_pico)
+
+    Raises:
+        ValueError: Se o motor ou o backend forem desconhecidos
+    """
+    # As contas são feitas em float: valores que não cabem viram math.inf
+    dados = _em_float(num_dados)
+    somas = _em_float(_quantidade_somas(num_dados, lados))
+    bytes_resultado = somas * CUSTOS["bytes_soma"]
+
+    if motor == "enumeracao":
+        # Todas as lados^n combinações ficam em memória ao mesmo tempo
+        combinacoes = _combinacoes(num_dados, lados)
+        bytes_combinacao = CUSTOS["enumeracao_bytes_base"] + CUSTOS["enumeracao_bytes_dado"] * dados
+        return Estimativa(
+            combinacoes * dados * CUSTOS["enumeracao_segundos"],
+            combinacoes * bytes_combinacao + bytes_resultado,
+        )
+
+    if motor == "convolucao":
+        # Cada dado percorre o vetor de somas até então: em média somas/2
+        # posições por dado, mais a conversão final em probabilidades.
+        # As contagens chegam a lados^(num_dados - 1)
+        bits = (dados - 1) * math.log2(lados) if lados > 1 else 0.0
+        segundos_posicao = CUSTOS["convolucao_segundos"] + bits * CUSTOS["convolucao_segundos_bit"]
+        # int do CPython: 28 bytes + 4 por dígito de 30 bits; os pequenos
+        # (até 256) são compartilhados e não ocupam memória nova
+        bytes_inteiro = 0 if bits <= 8 else 28 + 4 * (bits / 30 + 1)
+        return Estimativa(
+            somas * (dados / 2 + 2) * segundos_posicao,
+            somas * (16 + CUSTOS["convolucao_inteiros_soma"] * bytes_inteiro) + bytes_resultado,
+        )
+
+    if motor == "aproximacao":
+        return Estimativa(somas * CUSTOS["aproximacao_segundos"], bytes_resultado)
+
+    if motor in ("simulacao", "simulacao_em_blocos"):
+        if backend not in SEGUNDOS_POR_DADO:
+            raise ValueError(f"Backend desconhecido: {backend!r}")
+        # As duas simulações sorteiam em blocos, então a memória é limitada
+        # pelo bloco; a diferença é só a atualização da tela
+        jogadas_bloco = min(num_jogadas, TAMANHO_BLOCO)
+        faces_bloco = jogadas_bloco * dados
+        # Nas listas do Python puro, faces acima de 256 são objetos int
+        # próprios; no NumPy ficam como int64 dentro do vetor
+        fracao_grandes = 0.0 if backend == "pcg64" else max(0, lados - 257) / lados
+        bytes_face = CUSTOS["bytes_face"] + CUSTOS["bytes_inteiro"] * fracao_grandes
+        # Counters do bloco e do total, com uma entrada por soma sorteada
+        bytes_parcial = min(jogadas_bloco, somas) * CUSTOS["bytes_soma"]
+        bytes_contagem = min(_em_float(num_jogadas), somas) * CUSTOS["bytes_soma"]
+        return Estimativa(
+            _em_float(num_jogadas) * dados * SEGUNDOS_POR_DADO[backend],
+            faces_bloco * bytes_face + bytes_parcial + bytes_contagem,
+        )
+
+    raise ValueError(f"Motor desconhecido: {motor!r}")
+
+
+def _custo_comparacao(num_execucoes, colunas, backend):
+    """
+    Custo extra do modo de comparação, além das jogadas em si.
+
+    Args:
+        num_execucoes: Quantidade de execuções
+        colunas: Colunas da matriz de AgregadorExecucoes (somas ou faixas)
+        backend: Backend de dice_rng usado nas execuções
+    """
+    execucoes = _em_float(num_execucoes)
+    return Estimativa(
+        execucoes * (SEGUNDOS_POR_EXECUCAO[backend] + colunas * CUSTOS["celula_segundos"]),
+        execucoes * (colunas * CUSTOS["bytes_celula"] + CUSTOS["bytes_execucao"]),
+    )
+
+
+def _largura_faixas(num_dados, lados, somas_exibidas_max):
+    """Menor quantidade de somas por faixa que cabe no limite de exibição."""
+    somas = _quantidade_somas(num_dados, lados)
+    return max(1, -(-somas // somas_exibidas_max))
+
+
+def _custo_exibicao(num_dados, lados, agrupamento):
+    """Custo de montar o gráfico e a tabela com as somas agrupadas."""
+    linhas = -(-_quantidade_somas(num_dados, lados) // agrupamento)
+    return Estimativa(
+        linhas * CUSTOS["exibicao_segundos"],
+        linhas * CUSTOS["exibicao_bytes"],
+    )
+
+
+def _formatar_bytes(quantidade):
+    """Formata bytes em unidades legíveis (ex: 1.5 GB)."""
+    if quantidade >= _BYTES_EXIBIDOS_MAX:
+        return "mais de 1 PB"
+    for unidade in ("B", "KB", "MB", "GB"):
+        if quantidade < 1024:
+            return f"{quantidade:.1f} {unidade}"
+        quantidade /= 1024
+    return f"{quantidade:.1f} TB"
+
+
+def _formatar_segundos(segundos):
+    """Formata um tempo estimado (ex: 42 s), limitado a "mais de 1 ano"."""
+    if segundos >= _SEGUNDOS_EXIBIDOS_MAX:
+        return "mais de 1 ano"
+    return f"{segundos:.0f} s"
+
+
+def avaliar_pedido(num_dados, lados, num_jogadas, orcamento=ORCAMENTO_PADRAO,
+                   backend=BACKEND_PADRAO, exato_disponivel=False, num_execucoes=1):
+    """
+    Decide como (e se) um pedido deve ser executado.
+
+    Args:
+        num_dados: Quantidade de dados
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade de jogadas a simular
+        orcamento: Limites de tempo e memória (Orcamento)
+        backend: Backend de dice_rng usado na simulação
+        exato_disponivel: True se a tabela exata já está pronta
+            (ex: no pacote de aquecimento), sem custo de cálculo
+        num_execucoes: Execuções de num_jogadas cada; mais de uma inclui
+            o custo do modo de comparação (AgregadorExecucoes)
+
+    Returns:
+        Decisao
+
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    validar_parametros(num_dados, lados)
+    if not isinstance(num_jogadas, int) or num_jogadas <= 0:
+        raise ValueError("Número de jogadas deve ser um inteiro maior que zero")
+    if not isinstance(num_execucoes, int) or num_execucoes <= 0:
+        raise ValueError("Número de execuções deve ser um inteiro maior que zero")
+
+    avisos = []
+
+    def cabe(custo):
+        return custo.segundos <= orcamento.segundos_max and custo.bytes_pico <= orcamento.memoria_max
+
+    # Probabilidades teóricas: tabela pronta, enumeração, convolução ou
+    # aproximação. Com poucos dados a aproximação normal seria visivelmente
+    # errada (ex: 1 dado é uniforme, 2 dados são triangulares), então nesse
+    # caso a convolução é mantida e o pedido é recusado se não couber
+    if exato_disponivel:
+        motor_exato = "tabela"
+        custo_exato = Estimativa(0.0, 0)
+    else:
+        motor_exato = "enumeracao"
+        custo_exato = estimar_custo("enumeracao", num_dados, lados)
+        if not cabe(custo_exato):
+            motor_exato = "convolucao"
+            custo_exato = estimar_custo("convolucao", num_dados, lados)
+        if not cabe(custo_exato) and num_dados >= DADOS_MIN_APROXIMACAO:
+            motor_exato = "aproximacao"
+            avisos.append(
+                f"Probabilidades aproximadas pela distribuição normal: o cálculo exato "
+                f"levaria {_formatar_segundos(custo_exato.segundos)} e "
+                f"{_formatar_bytes(custo_exato.bytes_pico)}"
+            )
+            custo_exato = estimar_custo("aproximacao", num_dados, lados)
+
+    # Simulação: de uma vez ou em blocos, se for demorar
+    # No modo de comparação são num_execucoes simulações de num_jogadas
+    total_jogadas = num_jogadas * num_execucoes
+    motor_simulacao = "simulacao"
+    custo_simulacao = estimar_custo("simulacao", num_dados, lados, total_jogadas, backend)
+    if custo_simulacao.segundos > orcamento.segundos_interativo:
+        motor_simulacao = "simulacao_em_blocos"
+        custo_simulacao = estimar_custo("simulacao_em_blocos", num_dados, lados, total_jogadas, backend)
+
+    # Exibição: uma barra e uma linha por soma, ou por faixa de somas
+    agrupamento = _largura_faixas(num_dados, lados, orcamento.somas_exibidas_max)
+    if agrupamento > 1:
+        avisos.append(f"Gráfico e tabela agrupam as somas em faixas de {agrupamento:,}".replace(",", "."))
+    custo_exibicao = _custo_exibicao(num_dados, lados, agrupamento)
+
+    # Comparação: uma linha por execução na matriz, com uma coluna por faixa exibida
+    custo_comparacao = Estimativa(0.0, 0)
+    if num_execucoes > 1:
+        colunas = -(-_quantidade_somas(num_dados, lados) // agrupamento)
+        custo_comparacao = _custo_comparacao(num_execucoes, colunas, backend)
+
+    # Os controles da tela e a matriz de execuções ficam em memória junto com o resultado
+    estimativa = Estimativa(
+        custo_exato.segundos + custo_simulacao.segundos
+        + custo_exibicao.segundos + custo_comparacao.segundos,
+        max(custo_exato.bytes_pico, custo_simulacao.bytes_pico)
+        + custo_exibicao.bytes_pico + custo_comparacao.bytes_pico,
+    )
+
+    # Mesmo com os motores mais baratos o pedido não cabe no orçamento
+    if estimativa.bytes_pico > orcamento.memoria_max:
+        sugestao = "Reduza a quantidade de dados ou de lados."
+        if estimativa.bytes_pico - custo_comparacao.bytes_pico <= orcamento.memoria_max:
+            # Só a matriz de execuções não cabe
+            sugestao = "Reduza o número de execuções."
+        return Decisao(
+            "rejeitar", motor_exato, motor_simulacao, estimativa,
+            f"Memória estimada de {_formatar_bytes(estimativa.bytes_pico)} excede o "
+            f"limite de {_formatar_bytes(orcamento.memoria_max)}. {sugestao}",
+            agrupamento,
+        )
+
+    if estimativa.segundos > orcamento.segundos_max:
+        # Quantas jogadas (por execução) cabem no tempo que sobra depois
+        # do cálculo exato, da exibição e do custo fixo das execuções
+        maximo = 0.0
+        custo_fixo = custo_exato.segundos + custo_exibicao.segundos + custo_comparacao.segundos
+        if custo_fixo < orcamento.segundos_max:
+            segundos_por_jogada = (
+                _em_float(num_dados) * _em_float(num_execucoes) * SEGUNDOS_POR_DADO[backend]
+            )
+            maximo = (orcamento.segundos_max - custo_fixo) / segundos_por_jogada
+
+        tempo = (
+            f"Tempo estimado de {_formatar_segundos(estimativa.segundos)} excede o "
+            f"limite de {orcamento.segundos_max:.0f} s. "
+        )
+        if maximo < 1:
+            sugestao = "Reduza a quantidade de dados ou de lados."
+            if num_execucoes > 1 and custo_exato.segundos + custo_exibicao.segundos < orcamento.segundos_max:
+                # Nem uma jogada por execução cabe: são execuções demais
+                sugestao = "Reduza o número de execuções."
+            return Decisao(
+                "rejeitar", motor_exato, motor_simulacao, estimativa,
+                tempo + sugestao, agrupamento,
+            )
+        por_execucao = " por execução" if num_execucoes > 1 else ""
+        return Decisao(
+            "rejeitar", motor_exato, motor_simulacao, estimativa,
+            tempo + f"Reduza para no máximo {int(maximo):,} jogadas{por_execucao}.".replace(",", "."),
+            agrupamento,
+        )
+
+    if motor_simulacao == "simulacao_em_blocos":
+        avisos.append(
+            f"Simulação em blocos ({_formatar_segundos(custo_simulacao.segundos)}), "
+            f"com o gráfico atualizado durante a execução"
+        )
+
+    acao = "reduzir" if avisos else "aceitar"
+    return Decisao(acao, motor_exato, motor_simulacao, estimativa, ". ".join(avisos), agrupamento)
+
+
+def calibrar(backend=BACKEND_PADRAO):
+    """
+    Mede os custos nesta máquina e atualiza CUSTOS e SEGUNDOS_POR_DADO.
+
+    Leva cerca de um segundo. Útil ao implantar em hardware diferente.
+
+    Returns:
+        Dicionário com os valores medidos
+    """
+    # Cálculo exato: 6^6 combinações de 6 dados
+    num_dados, lados = 6, 6
+    combinacoes = lados ** num_dados
+    inicio = time.perf_counter()
+    calcular_probabilidades(num_dados, lados)
+    CUSTOS["enumeracao_segundos"] = (time.perf_counter() - inicio) / (combinacoes * num_dados)
+
+    tracemalloc.start()
+    try:
+        calcular_probabilidades(num_dados, lados)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    CUSTOS["enumeracao_bytes_base"] = pico / combinacoes - CUSTOS["enumeracao_bytes_dado"] * num_dados
+
+    # Simulação: 50.000 jogadas de 4 dados
+    gerador = criar_gerador(backend, semente=0)
+    num_jogadas = 50000
+    inicio = time.perf_counter()
+    simular_jogadas(4, 6, num_jogadas, gerador=gerador)
+    SEGUNDOS_POR_DADO[backend] = (time.perf_counter() - inicio) / (num_jogadas * 4)
+
+    return {
+        "enumeracao_segundos": CUSTOS["enumeracao_segundos"],
+        "enumeracao_bytes_base": CUSTOS["enumeracao_bytes_base"],
+        backend: SEGUNDOS_POR_DADO[backend],
+    }
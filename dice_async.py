@@ -0,0 +1,215 @@
+"""
+Módulo com versões assíncronas (awaitable) do cálculo e da simulação.
+
+As funções rodam o trabalho pesado em um executor (por padrão o executor
+do loop do asyncio), então podem ser usadas em handlers assíncronos do
+Flet ou em serviços asyncio sem travar o loop de eventos.
+
+- calcular_probabilidades_async(): pedidos feitos na mesma iteração do
+  loop são agrupados em uma única chamada ao executor.
+- iterar_simulacao_async(): entrega os resultados parciais bloco a bloco;
+  o cancelamento (asyncio.CancelledError) só é repassado depois que o
+  bloco em andamento termina, então o gerador fica livre para ser reusado.
+- simular_jogadas_async(): devolve apenas o resultado final.
+"""
+
+import asyncio
+import weakref
+from collections import Counter
+
+from dice_logic import calcular_probabilidades, TAMANHO_BLOCO
+from dice_rng import criar_gerador
+
+
+class AgrupadorCalculos:
+    """
+    Agrupa pedidos de calcular_probabilidades() em uma chamada ao executor.
+
+    Todos os pedidos feitos durante a mesma iteração do loop de eventos
+    são enviados juntos, e configurações repetidas são calculadas uma vez.
+    Deve ser usado sempre pelo mesmo loop de eventos.
+    """
+
+    def __init__(self, executor=None):
+        """
+        Args:
+            executor: Executor usado nos cálculos (None usa o padrão do loop)
+        """
+        self.executor = executor
+        self._pendentes = {}
+        self.despachos = 0
+
+    def calcular(self, num_dados, lados):
+        """
+        Agenda o cálculo de uma configuração.
+
+        Returns:
+            Future com o dicionário de probabilidades
+        """
+        loop = asyncio.get_running_loop()
+
+        # O primeiro pedido da iteração agenda o envio do lote
+        if not self._pendentes:
+            loop.call_soon(self._despachar, loop)
+
+        configuracao = (num_dados, lados)
+        if configuracao not in self._pendentes:
+            self._pendentes[configuracao] = loop.create_future()
+        return self._pendentes[configuracao]
+
+    def _despachar(self, loop):
+        """Envia todos os pedidos pendentes em uma única chamada."""
+        lote, self._pendentes = self._pendentes, {}
+        self.despachos += 1
+
+        tarefa = loop.run_in_executor(self.executor, _calcular_lote, list(lote))
+        tarefa.add_done_callback(lambda resultado: _resolver_lote(lote, resultado))
+
+
+def _calcular_lote(configuracoes):
+    """
+    Calcula várias configurações (roda dentro do executor).
+
+    Returns:
+        Lista com o dicionário de probabilidades ou a exceção de cada uma
+    """
+    resultados = []
+    for num_dados, lados in configuracoes:
+        try:
+            resultados.append(calcular_probabilidades(num_dados, lados))
+        except ValueError as error:
+            resultados.append(error)
+    return resultados
+
+
+def _resolver_lote(lote, tarefa):
+    """Repassa os resultados do lote para os futures de cada pedido."""
+    if tarefa.cancelled():
+        for futuro in lote.values():
+            futuro.cancel()
+        return
+
+    if tarefa.exception() is not None:
+        for futuro in lote.values():
+            if not futuro.done():
+                futuro.set_exception(tarefa.exception())
+        return
+
+    for futuro, resultado in zip(lote.values(), tarefa.result()):
+        # O pedido pode ter sido cancelado enquanto o lote rodava
+        if futuro.done():
+            continue
+        if isinstance(resultado, Exception):
+            futuro.set_exception(resultado)
+        else:
+            futuro.set_result(resultado)
+
+
+# Um agrupador por loop de eventos e executor
+_agrupadores = weakref.WeakKeyDictionary()
+
+
+async def calcular_probabilidades_async(num_dados, lados, executor=None):
+    """
+    Versão assíncrona de calcular_probabilidades().
+
+    Args:
+        num_dados: Quantidade de dados (inteiro > 0)
+        lados: Número de lados de cada dado (inteiro > 0)
+        executor: Executor usado no cálculo (None usa o padrão do loop)
+
+    Returns:
+        Dicionário com somas possíveis e suas probabilidades
+
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    loop = asyncio.get_running_loop()
+    agrupadores = _agrupadores.setdefault(loop, {})
+    if executor not in agrupadores:
+        agrupadores[executor] = AgrupadorCalculos(executor)
+
+    # shield: cancelar um pedido não cancela o lote dos outros pedidos
+    futuro = agrupadores[executor].calcular(num_dados, lados)
+    return await asyncio.shield(futuro)
+
+
+async def _aguardar_sem_cancelar(futuro):
+    """Espera o futuro terminar, ignorando novos cancelamentos."""
+    while not futuro.done():
+        try:
+            await asyncio.shield(futuro)
+        except asyncio.CancelledError:
+            pass
+
+
+async def iterar_simulacao_async(num_dados, lados, num_jogadas, gerador=None,
+                                 executor=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Simula as jogadas no executor, entregando o histograma a cada bloco.
+
+    Exemplo:
+        async for contagem, feitas in iterar_simulacao_async(2, 6, 10**7):
+            mostrar(contagem, feitas)
+
+    Args:
+        num_dados: Quantidade de dados por jogada
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade total de jogadas
+        gerador: Gerador de dice_rng (None cria um novo gerador)
+        executor: Executor usado nos blocos (None usa o padrão do loop)
+        tamanho_bloco: Quantidade de jogadas por bloco
+
+    Yields:
+        Tupla (contagem acumulada, jogadas feitas até agora).
+        A contagem não deve ser alterada por quem consome o iterador.
+    """
+    if not isinstance(num_jogadas, int) or not isinstance(tamanho_bloco, int):
+        raise ValueError("Número de jogadas e tamanho do bloco devem ser inteiros")
+    if tamanho_bloco <= 0:
+        raise ValueError("Tamanho do bloco deve ser maior que zero")
+
+    # Os blocos rodam em sequência, então o gerador nunca é usado por
+    # duas threads ao mesmo tempo, mesmo que o executor tenha várias
+    if gerador is None:
+        gerador = criar_gerador()
+
+    loop = asyncio.get_running_loop()
+    contagem = Counter()
+    feitas = 0
+
+    while feitas < num_jogadas:
+        bloco = min(tamanho_bloco, num_jogadas - feitas)
+        pendente = loop.run_in_executor(
+            executor, gerador.contar_somas, num_dados, lados, bloco
+        )
+        try:
+            parcial = await asyncio.shield(pendente)
+        except asyncio.CancelledError:
+            # A thread do executor não pode ser interrompida: espera o bloco
+            # em andamento terminar, para que o gerador esteja livre quando
+            # quem cancelou voltar a usá-lo
+            await _aguardar_sem_cancelar(pendente)
+            raise
+        contagem.update(parcial)
+        feitas += bloco
+        yield contagem, feitas
+
+
+async def simular_jogadas_async(num_dados, lados, num_jogadas, gerador=None,
+                                executor=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Versão assíncrona de simular_jogadas(), cancelável entre blocos.
+
+    Args:
+        Os mesmos de iterar_simulacao_async()
+
+    Returns:
+        Counter com a contagem de cada resultado
+    """
+    contagem = Counter()
+    async for contagem, _ in iterar_simulacao_async(
+        num_dados, lados, num_jogadas, gerador, executor, tamanho_bloco
+    ):
+        pass
+    return contagem
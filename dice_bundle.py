@@ -0,0 +1,170 @@
+"""
+Módulo do pacote de aquecimento com as configurações mais usadas.
+
+O pacote é um arquivo de tabelas (dice_store) gerado uma vez, no build,
+com as probabilidades e distribuições acumuladas das configurações
+populares. O aplicativo o abre sob demanda no primeiro uso, e então o
+primeiro clique em uma configuração comum não calcula nada.
+
+Para gerar o pacote:
+    python dice_bundle.py                     # configurações padrão
+    python dice_bundle.py --config 2d6 --config 5d6 --saida pacote.bin
+"""
+
+import argparse
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+from dice_logic import (
+    calcular_probabilidades,
+    contar_combinacoes,
+    em_percentuais_acumulados,
+)
+from dice_store import gravar_tabelas, TabelasProbabilidades
+
+# Caminho padrão do pacote, ao lado deste módulo
+CAMINHO_PADRAO = Path(__file__).parent / "dados" / "pacote_popular.bin"
+
+# Configurações (num_dados, lados) incluídas por padrão
+CONFIGURACOES_POPULARES = [
+    (1, 4), (2, 4), (3, 4),
+    (1, 6), (2, 6), (3, 6), (4, 6), (5, 6), (6, 6),
+    (1, 8), (2, 8), (3, 8),
+    (1, 10), (2, 10), (3, 10),
+    (1, 12), (2, 12),
+    (1, 20), (2, 20), (3, 20),
+    (1, 100), (2, 100),
+]
+
+
+def gerar_pacote(caminho=CAMINHO_PADRAO, configuracoes=CONFIGURACOES_POPULARES):
+    """
+    Pré-calcula as configurações e grava o pacote de aquecimento.
+
+    Args:
+        caminho: Caminho do arquivo a ser gerado
+        configuracoes: Iterável de pares (num_dados, lados)
+
+    Returns:
+        Quantidade de configurações gravadas
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    return gravar_tabelas(caminho, configuracoes, incluir_acumuladas=True)
+
+
+class PacoteAquecimento:
+    """
+    Acesso preguiçoso ao pacote de aquecimento.
+
+    O arquivo só é aberto na primeira consulta. Configurações fora do
+    pacote (ou pacote inexistente) são calculadas normalmente, então o
+    pacote é apenas um atalho: o resultado é sempre o mesmo.
+    Pode ser compartilhado entre sessões e threads.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO):
+        """
+        Args:
+            caminho: Caminho do pacote gerado por gerar_pacote()
+        """
+        self.caminho = Path(caminho)
+        self._tabelas = None
+        self._carregado = False
+        self._trava = threading.Lock()
+        # Dicionários já convertidos, prontos para o gráfico e a tabela
+        self._dicionarios = {}
+
+    def _abrir(self):
+        """Abre o pacote na primeira chamada (ou None se não existir)."""
+        if not self._carregado:
+            with self._trava:
+                if not self._carregado:
+                    try:
+                        self._tabelas = TabelasProbabilidades(self.caminho)
+                    except (OSError, ValueError):
+                        # Sem pacote válido: tudo será calculado na hora
+                        self._tabelas = None
+                    self._carregado = True
+        return self._tabelas
+
+    def __contains__(self, configuracao):
+        tabelas = self._abrir()
+        return tabelas is not None and tuple(configuracao) in tabelas
+
+    def probabilidades(self, num_dados, lados):
+        """
+        Retorna as probabilidades, do pacote ou calculadas na hora.
+
+        Returns:
+            Dicionário no formato de calcular_probabilidades()
+
+        Raises:
+            ValueError: Se os parâmetros não forem inteiros positivos
+        """
+        configuracao = (num_dados, lados)
+        if configuracao in self._dicionarios:
+            return self._dicionarios[configuracao]
+
+        if configuracao in self:
+            probabilidades = self._tabelas.como_dicionario(num_dados, lados)
+            self._dicionarios[configuracao] = probabilidades
+            return probabilidades
+
+        return calcular_probabilidades(num_dados, lados)
+
+    def percentil(self, num_dados, lados, percentual):
+        """
+        Retorna a menor soma cuja probabilidade acumulada é ≥ percentual.
+
+        Ex: percentil(2, 6, 50) == 7 (mediana de 2D6)
+
+        Args:
+            num_dados: Quantidade de dados
+            lados: Número de lados de cada dado
+            percentual: Valor entre 0 e 100
+
+        Raises:
+            ValueError: Se o percentual estiver fora de [0, 100]
+        """
+        if not 0 <= percentual <= 100:
+            raise ValueError("Percentual deve estar entre 0 e 100")
+
+        if (num_dados, lados) in self:
+            acumuladas = self._tabelas.acumuladas(num_dados, lados)
+            soma_minima = self._tabelas.soma_minima(num_dados, lados)
+        else:
+            contagens = contar_combinacoes(num_dados, lados)
+            soma_minima = min(contagens)
+            acumuladas = em_percentuais_acumulados(contagens)
+
+        # As acumuladas vêm das contagens inteiras: a última é exatamente 100
+        return soma_minima + bisect_left(acumuladas, percentual)
+
+
+def _ler_configuracao(texto):
+    """Converte "3d6" em (3, 6) para a linha de comando."""
+    try:
+        num_dados, lados = texto.lower().split("d")
+        return int(num_dados), int(lados)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Configuração inválida: {texto!r} (use o formato 3d6)")
+
+
+def main(argumentos=None):
+    """Gera o pacote pela linha de comando."""
+    parser = argparse.ArgumentParser(description="Gera o pacote de aquecimento")
+    parser.add_argument("--saida", type=Path, default=CAMINHO_PADRAO,
+                        help="Arquivo a ser gerado")
+    parser.add_argument("--config", type=_ler_configuracao, action="append",
+                        help="Configuração no formato 3d6 (pode repetir; padrão: populares)")
+    args = parser.parse_args(argumentos)
+
+    quantidade = gerar_pacote(args.saida, args.config or CONFIGURACOES_POPULARES)
+    print(f"{quantidade} configurações gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
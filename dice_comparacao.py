@@ -0,0 +1,204 @@
+"""
+Módulo de comparação entre muitas execuções da mesma simulação.
+
+Acumula os histogramas de milhares de execuções (sementes ou backends
+diferentes) em uma matriz 2-D compacta — uma linha por execução, uma
+coluna por soma possível — e calcula por soma a média, a variância e uma
+faixa de confiança, além de medidas de divergência de cada execução em
+relação à distribuição teórica.
+
+Todas as estatísticas são em % (frequência relativa de cada execução),
+na mesma escala de calcular_probabilidades().
+"""
+
+import math
+from array import array
+from collections import namedtuple
+from operator import mul, truediv
+from statistics import NormalDist
+
+from dice_logic import (
+    agrupar_somas,
+    calcular_probabilidades,
+    simular_jogadas,
+    validar_parametros,
+)
+from dice_rng import iterar_fluxos, BACKEND_PADRAO
+
+# Estatísticas de uma soma ao longo das execuções (valores em %)
+ResumoSoma = namedtuple("ResumoSoma", ["soma", "media", "variancia", "inferior", "superior", "teorica"])
+
+# Divergência de uma execução em relação à distribuição teórica
+#   kl: divergência de Kullback-Leibler (observada ‖ teórica), em nats
+#   variacao_total: distância de variação total (0 a 1)
+#   qui_quadrado: estatística qui-quadrado de Pearson
+Divergencia = namedtuple("Divergencia", ["kl", "variacao_total", "qui_quadrado"])
+
+
+class AgregadorExecucoes:
+    """
+    Acumula os resultados de várias execuções de uma configuração.
+
+    Exemplo:
+        agregador = AgregadorExecucoes(2, 6)
+        for semente in range(1000):
+            agregador.adicionar(simular_jogadas(2, 6, 1000, gerador=criar_gerador(semente=semente)))
+        resumo = agregador.estatisticas()
+    """
+
+    def __init__(self, num_dados, lados, probabilidades=None, largura=1):
+        """
+        Args:
+            num_dados: Quantidade de dados
+            lados: Número de lados de cada dado
+            probabilidades: Distribuição teórica (None usa calcular_probabilidades)
+            largura: Somas por coluna; com largura > 1 cada coluna é uma
+                faixa de somas (ver agrupar_somas) identificada pela primeira
+        """
+        validar_parametros(num_dados, lados)
+        if not isinstance(largura, int) or largura <= 0:
+            raise ValueError("A largura deve ser um inteiro maior que zero")
+        self.num_dados = num_dados
+        self.lados = lados
+        self.largura = largura
+        # Primeira soma de cada coluna
+        self.somas = range(num_dados, num_dados * lados + 1, largura)
+
+        if probabilidades is None:
+            probabilidades = calcular_probabilidades(num_dados, lados)
+        probabilidades = agrupar_somas(probabilidades, num_dados, largura)
+        self.probabilidades = [probabilidades.get(soma, 0.0) for soma in self.somas]
+
+        # Matriz execuções × somas guardada linha a linha em um único array
+        self._contagens = array("q")
+        # Total de jogadas de cada execução (para converter em frequência)
+        self._totais = array("q")
+
+    @property
+    def num_execucoes(self):
+        """Quantidade de execuções acumuladas."""
+        return len(self._totais)
+
+    def adicionar(self, contagem):
+        """
+        Acrescenta o histograma de uma execução.
+
+        Args:
+            contagem: Counter retornado por simular_jogadas()
+
+        Raises:
+            ValueError: Se houver somas impossíveis ou nenhuma jogada
+        """
+        inicio = self.somas.start
+        if any(not inicio <= soma < self.somas.stop for soma in contagem):
+            raise ValueError("A contagem tem somas impossíveis para esta configuração")
+
+        linha = [0] * len(self.somas)
+        for soma, count in contagem.items():
+            linha[(soma - inicio) // self.largura] += count
+
+        total = sum(linha)
+        if not total:
+            raise ValueError("A contagem não tem nenhuma jogada")
+
+        self._contagens.extend(linha)
+        self._totais.append(total)
+
+    def linha(self, indice):
+        """Retorna as contagens de uma execução (uma por soma)."""
+        colunas = len(self.somas)
+        return self._contagens[indice * colunas:(indice + 1) * colunas]
+
+    def _frequencias_coluna(self, coluna):
+        """Frequências (%) de uma soma em todas as execuções."""
+        contagens = self._contagens[coluna::len(self.somas)]
+        return [f * 100 for f in map(truediv, contagens, self._totais)]
+
+    def estatisticas(self, nivel=0.95):
+        """
+        Calcula média, variância e faixa de confiança de cada soma.
+
+        A faixa é média ± z·desvio, onde z é o quantil normal do nível:
+        cerca de `nivel` das execuções caem dentro dela.
+
+        Args:
+            nivel: Nível de confiança da faixa (entre 0 e 1)
+
+        Returns:
+            Lista de ResumoSoma, uma por soma possível (ou por faixa)
+
+        Raises:
+            ValueError: Se não houver execuções ou o nível for inválido
+        """
+        if not self.num_execucoes:
+            raise ValueError("Nenhuma execução foi adicionada")
+        if not 0 < nivel < 1:
+            raise ValueError("O nível deve estar entre 0 e 1")
+
+        z = NormalDist().inv_cdf((1 + nivel) / 2)
+        n = self.num_execucoes
+
+        resumo = []
+        for coluna, soma in enumerate(self.somas):
+            frequencias = self._frequencias_coluna(coluna)
+            media = sum(frequencias) / n
+            # Variância amostral (n - 1); zero com uma única execução
+            quadrados = sum(map(mul, frequencias, frequencias))
+            variancia = max(0.0, (quadrados - n * media * media) / (n - 1)) if n > 1 else 0.0
+            margem = z * math.sqrt(variancia)
+            resumo.append(ResumoSoma(
+                soma, media, variancia,
+                max(0.0, media - margem), min(100.0, media + margem),
+                self.probabilidades[coluna],
+            ))
+        return resumo
+
+    def divergencias(self):
+        """
+        Mede o quanto cada execução se afasta da distribuição teórica.
+
+        Returns:
+            Lista de Divergencia, uma por execução, na ordem de adição
+        """
+        colunas = len(self.somas)
+        teoricas = [p / 100 for p in self.probabilidades]
+
+        resultado = []
+        for indice, total in enumerate(self._totais):
+            linha = self._contagens[indice * colunas:(indice + 1) * colunas]
+            kl = variacao = qui = 0.0
+            for count, teorica in zip(linha, teoricas):
+                observada = count / total
+                if observada > 0:
+                    # Soma observada com probabilidade teórica zero: divergência infinita
+                    kl += observada * math.log(observada / teorica) if teorica > 0 else math.inf
+                variacao += abs(observada - teorica)
+                if teorica > 0:
+                    esperado = teorica * total
+                    qui += (count - esperado) ** 2 / esperado
+            resultado.append(Divergencia(kl, variacao / 2, qui))
+        return resultado
+
+
+def executar_comparacao(num_dados, lados, num_jogadas, num_execucoes,
+                        semente=None, backend=BACKEND_PADRAO, probabilidades=None):
+    """
+    Executa a mesma simulação várias vezes, cada uma em um fluxo independente.
+
+    Args:
+        num_dados: Quantidade de dados
+        lados: Número de lados de cada dado
+        num_jogadas: Jogadas de cada execução
+        num_execucoes: Quantidade de execuções
+        semente: Semente base (None sorteia uma); a execução i usa o fluxo i
+        backend: Backend de dice_rng
+        probabilidades: Distribuição teórica (None usa calcular_probabilidades)
+
+    Returns:
+        AgregadorExecucoes com todas as execuções
+    """
+    agregador = AgregadorExecucoes(num_dados, lados, probabilidades)
+    # Um gerador por vez: a memória não cresce com o número de execuções
+    for gerador in iterar_fluxos(backend, semente, num_execucoes):
+        agregador.adicionar(simular_jogadas(num_dados, lados, num_jogadas, gerador=gerador))
+    return agregador
@@ -0,0 +1,371 @@
+"""
+Módulo com estatísticas sobre os dados individuais (não apenas a soma).
+
+Responde perguntas como "P(pelo menos dois 6)", "distribuição do maior
+dado" ou "quantos sucessos ≥ 5 em uma parada de dados". Os cálculos
+exatos usam fórmulas binomiais/multinomiais e programação dinâmica, sem
+enumerar todas as combinações com product(). Cada cálculo exato tem um
+simulador correspondente.
+
+Os formatos de retorno seguem os da soma:
+    calcular_*  → dicionário {valor: probabilidade em %}, ordenado
+    simular_*   → Counter {valor: quantidade de jogadas}
+"""
+
+from collections import Counter
+from itertools import accumulate
+from math import comb
+from operator import add, sub
+
+from dice_logic import validar_parametros, TAMANHO_BLOCO
+from dice_rng import gerador_da_thread
+
+
+def _normalizar_faces(faces, lados):
+    """
+    Converte uma face ou um iterável de faces em um conjunto validado.
+
+    Raises:
+        ValueError: Se alguma face estiver fora de 1..lados
+    """
+    if isinstance(faces, int):
+        faces = [faces]
+    faces = set(faces)
+    if not faces or any(not isinstance(f, int) or not 1 <= f <= lados for f in faces):
+        raise ValueError(f"As faces devem ser inteiros entre 1 e {lados}")
+    return faces
+
+
+def _validar_alvo(alvo, lados):
+    """Valida o valor mínimo de sucesso de uma parada de dados."""
+    if not isinstance(alvo, int) or not 1 <= alvo <= lados:
+        raise ValueError(f"O alvo deve ser um inteiro entre 1 e {lados}")
+
+
+def _em_percentual(contagens, total):
+    """Converte contagens exatas em probabilidades (%), omitindo zeros."""
+    return {
+        valor: (count / total) * 100
+        for valor, count in sorted(contagens.items())
+        if count
+    }
+
+
+# ============================================
+# CÁLCULOS EXATOS
+# ============================================
+
+def calcular_contagem_faces(num_dados, lados, faces):
+    """
+    Distribuição de quantos dados mostram uma das faces escolhidas.
+
+    Cada dado acerta com m/lados de chance (m = nº de faces escolhidas),
+    então a quantidade de acertos é binomial:
+        combinações(k) = C(n, k) · m^k · (lados - m)^(n - k)
+
+    Args:
+        num_dados: Quantidade de dados
+        lados: Número de lados de cada dado
+        faces: Face (ex: 6) ou iterável de faces (ex: {5, 6})
+
+    Returns:
+        Dicionário {quantidade de dados: probabilidade em %}
+    """
+    validar_parametros(num_dados, lados)
+    m = len(_normalizar_faces(faces, lados))
+
+    contagens = {
+        k: comb(num_dados, k) * m ** k * (lados - m) ** (num_dados - k)
+        for k in range(num_dados + 1)
+    }
+    return _em_percentual(contagens, lados ** num_dados)
+
+
+def calcular_sucessos(num_dados, lados, alvo):
+    """
+    Distribuição do número de sucessos (dados com resultado ≥ alvo).
+
+    Ex: calcular_sucessos(5, 10, 8) para uma parada de 5D10 com sucesso em 8+.
+
+    Returns:
+        Dicionário {sucessos: probabilidade em %}
+    """
+    validar_parametros(num_dados, lados)
+    _validar_alvo(alvo, lados)
+    return calcular_contagem_faces(num_dados, lados, range(alvo, lados + 1))
+
+
+def calcular_maximo(num_dados, lados):
+    """
+    Distribuição do maior dado.
+
+    P(máximo ≤ m) = (m / lados)^n, logo o número de combinações com
+    máximo exatamente m é m^n - (m - 1)^n.
+
+    Returns:
+        Dicionário {maior valor: probabilidade em %}
+    """
+    validar_parametros(num_dados, lados)
+    contagens = {m: m ** num_dados - (m - 1) ** num_dados for m in range(1, lados + 1)}
+    return _em_percentual(contagens, lados ** num_dados)
+
+
+def calcular_minimo(num_dados, lados):
+    """
+    Distribuição do menor dado.
+
+    P(mínimo ≥ m) = ((lados - m + 1) / lados)^n, logo o número de
+    combinações com mínimo exatamente m é (lados-m+1)^n - (lados-m)^n.
+
+    Returns:
+        Dicionário {menor valor: probabilidade em %}
+    """
+    validar_parametros(num_dados, lados)
+    contagens = {
+        m: (lados - m + 1) ** num_dados - (lados - m) ** num_dados
+        for m in range(1, lados + 1)
+    }
+    return _em_percentual(contagens, lados ** num_dados)
+
+
+def _faixas_contiguas(faces):
+    """Divide um conjunto de faces em faixas contíguas (primeira, última)."""
+    faixas = []
+    for face in sorted(faces):
+        if faixas and faixas[-1][1] == face - 1:
+            faixas[-1] = (faixas[-1][0], face)
+        else:
+            faixas.append((face, face))
+    return faixas
+
+
+def _convoluir_faixas(prefixo, faixas, tamanho):
+    """
+    Adiciona um dado com as faces das faixas ao vetor {soma: combinações}.
+
+    Para uma faixa de faces [a, b], a nova contagem da soma s é a soma das
+    contagens de s-b até s-a: uma janela móvel calculada por somas de
+    prefixo, em O(len(coeficientes)) por faixa em vez de por face.
+
+    Args:
+        prefixo: Somas de prefixo ([0, *accumulate(coeficientes)]) da lista
+            de combinações por soma (índice = soma)
+        faixas: Faixas de faces de _faixas_contiguas()
+        tamanho: Tamanho da lista resultante
+
+    Returns:
+        Lista de combinações por soma, com `tamanho` posições
+    """
+    resultado = [0] * tamanho
+    m = len(prefixo) - 1
+    for primeira, ultima in faixas:
+        largura = ultima - primeira + 1
+        # Janela i: coeficientes[i - largura + 1 .. i], para i em 0..m+largura-2
+        altos = prefixo[1:] + [prefixo[-1]] * (largura - 1)
+        baixos = [0] * (largura - 1) + prefixo[:m]
+        janelas = list(map(sub, altos, baixos))
+        fim = primeira + len(janelas)
+        resultado[primeira:fim] = map(add, resultado[primeira:fim], janelas)
+    return resultado
+
+
+def calcular_conjunta_soma_faces(num_dados, lados, faces):
+    """
+    Distribuição conjunta da soma e de quantos dados mostram as faces.
+
+    Programação dinâmica: adiciona um dado por vez, guardando para cada
+    quantidade de acertos o vetor soma → combinações, em vez de enumerar
+    lados^n jogadas. As faces são separadas em acertos e erros, e cada
+    classe entra uma vez por dado, em faixas contíguas (ver
+    _convoluir_faixas()), então o custo não cresce com lados².
+
+    Args:
+        num_dados: Quantidade de dados
+        lados: Número de lados de cada dado
+        faces: Face ou iterável de faces contadas como acerto
+
+    Returns:
+        Dicionário {(soma, acertos): probabilidade em %}
+    """
+    validar_parametros(num_dados, lados)
+    faces = _normalizar_faces(faces, lados)
+
+    faixas_acerto = _faixas_contiguas(faces)
+    faixas_erro = _faixas_contiguas(set(range(1, lados + 1)) - faces)
+
+    # por_acertos[k][s]: combinações com soma s e k acertos
+    por_acertos = [[1]]
+    for dado in range(1, num_dados + 1):
+        tamanho = dado * lados + 1
+        # Cada vetor entra com erro (mesmos acertos) e com acerto (+1)
+        prefixos = [[0, *accumulate(vetor)] for vetor in por_acertos]
+        proximos = []
+        for acertos in range(dado + 1):
+            vetor = [0] * tamanho
+            if acertos < dado:
+                vetor = _convoluir_faixas(prefixos[acertos], faixas_erro, tamanho)
+            if acertos > 0:
+                com_acerto = _convoluir_faixas(prefixos[acertos - 1], faixas_acerto, tamanho)
+                vetor = list(map(add, vetor, com_acerto))
+            proximos.append(vetor)
+        por_acertos = proximos
+
+    estados = {
+        (soma, acertos): count
+        for acertos, vetor in enumerate(por_acertos)
+        for soma, count in enumerate(vetor)
+        if count
+    }
+    return _em_percentual(estados, lados ** num_dados)
+
+
+def condicionar(conjunta, condicao):
+    """
+    Distribuição condicional da soma dado um critério sobre os acertos.
+
+    Ex: soma de 3D6 sabendo que saiu pelo menos um 6:
+        conjunta = calcular_conjunta_soma_faces(3, 6, 6)
+        condicionar(conjunta, lambda acertos: acertos >= 1)
+
+    Args:
+        conjunta: Resultado de calcular_conjunta_soma_faces()
+        condicao: Função que recebe a quantidade de acertos e retorna bool
+
+    Returns:
+        Dicionário {soma: probabilidade condicional em %}
+
+    Raises:
+        ValueError: Se a condição nunca puder ocorrer
+    """
+    filtrada = Counter()
+    for (soma, acertos), prob in conjunta.items():
+        if condicao(acertos):
+            filtrada[soma] += prob
+
+    total = sum(filtrada.values())
+    if total <= 0:
+        raise ValueError("A condição tem probabilidade zero")
+    return {soma: (prob / total) * 100 for soma, prob in sorted(filtrada.items())}
+
+
+def probabilidade_pelo_menos(distribuicao, minimo):
+    """
+    Soma das probabilidades dos valores ≥ minimo.
+
+    Ex: P(pelo menos dois 6 em 4D6):
+        probabilidade_pelo_menos(calcular_contagem_faces(4, 6, 6), 2)
+
+    Returns:
+        Probabilidade em %
+    """
+    return sum(prob for valor, prob in distribuicao.items() if valor >= minimo)
+
+
+# ============================================
+# SIMULAÇÕES
+# ============================================
+
+def _simular_estatistica(num_dados, lados, num_jogadas, gerador, reducao,
+                         tabela=None, deslocamento=0):
+    """
+    Simula jogadas em blocos e conta o valor de uma estatística por jogada.
+
+    A estatística é `reducao` (max, min ou sum) aplicada às faces de cada
+    jogada, depois de trocar cada face por tabela[face], se houver tabela.
+    Como em contar_somas(), tudo roda em funções nativas: map() e zip() no
+    Python puro, ou matriz (bloco, num_dados) e bincount nos backends
+    vetorizados (NumPy).
+
+    Args:
+        reducao: max, min ou sum (builtins)
+        tabela: Lista com o valor de cada face (0 a lados-1, como vêm do
+            gerador), ex: 1 para acerto e 0 para erro
+        deslocamento: Somado ao resultado (ex: 1 para voltar às faces 1..lados)
+
+    Returns:
+        Counter {valor da estatística: quantidade de jogadas}
+    """
+    validar_parametros(num_dados, lados)
+    if gerador is None:
+        gerador = gerador_da_thread()
+
+    contagem = Counter()
+    restantes = num_jogadas
+    while restantes > 0:
+        bloco = min(restantes, TAMANHO_BLOCO)
+        faces = gerador.inteiros(lados, num_dados * bloco)
+        if hasattr(faces, "reshape"):
+            parcial = _reduzir_vetorizado(faces, bloco, num_dados, reducao, tabela)
+        else:
+            if tabela is not None:
+                faces = map(tabela.__getitem__, faces)
+            # Agrupa as faces de num_dados em num_dados (uma jogada por grupo)
+            parcial = Counter(map(reducao, zip(*[iter(faces)] * num_dados)))
+        for valor, count in parcial.items():
+            contagem[valor + deslocamento] += count
+        restantes -= bloco
+    return contagem
+
+
+def _reduzir_vetorizado(faces, bloco, num_dados, reducao, tabela):
+    """Versão de _simular_estatistica() para vetores do NumPy."""
+    import numpy
+
+    # Uma linha por jogada; índices int64 porque bincount não aceita uint64
+    matriz = faces.reshape(bloco, num_dados).astype(numpy.int64)
+    if tabela is not None:
+        matriz = numpy.asarray(tabela, dtype=numpy.int64)[matriz]
+    valores = getattr(matriz, reducao.__name__)(axis=1)
+    return {
+        valor: count
+        for valor, count in enumerate(numpy.bincount(valores).tolist())
+        if count
+    }
+
+
+def simular_contagem_faces(num_dados, lados, faces, num_jogadas, gerador=None):
+    """
+    Simula quantos dados mostram uma das faces escolhidas em cada jogada.
+
+    Returns:
+        Counter {quantidade de dados: quantidade de jogadas}
+    """
+    validar_parametros(num_dados, lados)
+    faces = _normalizar_faces(faces, lados)
+    # As faces do gerador começam em 0
+    tabela = [int(face + 1 in faces) for face in range(lados)]
+    return _simular_estatistica(num_dados, lados, num_jogadas, gerador, sum, tabela)
+
+
+def simular_sucessos(num_dados, lados, alvo, num_jogadas, gerador=None):
+    """
+    Simula o número de sucessos (dados com resultado ≥ alvo) por jogada.
+
+    Returns:
+        Counter {sucessos: quantidade de jogadas}
+    """
+    validar_parametros(num_dados, lados)
+    _validar_alvo(alvo, lados)
+    limite = alvo - 1  # Faces do gerador começam em 0
+    tabela = [int(face >= limite) for face in range(lados)]
+    return _simular_estatistica(num_dados, lados, num_jogadas, gerador, sum, tabela)
+
+
+def simular_maximo(num_dados, lados, num_jogadas, gerador=None):
+    """
+    Simula o maior dado de cada jogada.
+
+    Returns:
+        Counter {maior valor: quantidade de jogadas}
+    """
+    return _simular_estatistica(num_dados, lados, num_jogadas, gerador, max, deslocamento=1)
+
+
+def simular_minimo(num_dados, lados, num_jogadas, gerador=None):
+    """
+    Simula o menor dado de cada jogada.
+
+    Returns:
+        Counter {menor valor: quantidade de jogadas}
+    """
+    return _simular_estatistica(num_dados, lados, num_jogadas, gerador, min, deslocamento=1)
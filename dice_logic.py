@@ -3,30 +3,50 @@ Módulo contendo a lógica principal do simulador de dados.
 Contém funções para cálculo de probabilidades e simulação de jogadas.
 """
 
-from itertools import product
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, chain, islice, product, repeat
+from operator import sub
 from collections import Counter
+import math
 import random
 
-def calcular_probabilidades(num_dados, lados):
+from dice_rng import iterar_fluxos, gerador_da_thread, BACKEND_PADRAO
+
+# Quantidade de jogadas geradas de uma vez pelos geradores de dice_rng
+TAMANHO_BLOCO = 65536
+
+# Valor de `gerador` que usa o estado global do módulo random
+GERADOR_GLOBAL = "global"
+
+def validar_parametros(num_dados, lados):
     """
-    Calcula todas as combinações possíveis e suas probabilidades.
+    Valida a quantidade de dados e o número de lados.
+    
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    if not isinstance(num_dados, int) or not isinstance(lados, int):
+        raise ValueError("Quantidade de dados e número de lados devem ser números inteiros")
+    
+    if num_dados <= 0 or lados <= 0:
+        raise ValueError("Quantidade de dados e número de lados devem ser maiores que zero")
+
+def contar_combinacoes(num_dados, lados):
+    """
+    Conta quantas combinações de faces resultam em cada soma.
     
     Args:
         num_dados: Quantidade de dados a serem jogados (inteiro > 0)
         lados: Número de lados de cada dado (inteiro > 0)
         
     Returns:
-        Dicionário com somas possíveis e suas probabilidades
+        Dicionário {soma: quantidade de combinações}, ordenado pela soma
         
     Raises:
         ValueError: Se os parâmetros não forem inteiros positivos
     """
     # Valida os parâmetros
-    if not isinstance(num_dados, int) or not isinstance(lados, int):
-        raise ValueError("Quantidade de dados e número de lados devem ser números inteiros")
-    
-    if num_dados <= 0 or lados <= 0:
-        raise ValueError("Quantidade de dados e número de lados devem ser maiores que zero")
+    validar_parametros(num_dados, lados)
     
     # Gera todas as combinações possíveis de resultados
     # product() cria o produto cartesiano - todas as combinações
@@ -38,17 +58,159 @@ def calcular_probabilidades(num_dados, lados):
     
     # Conta quantas vezes cada soma aparece
     contagem = Counter(somas)
+    return dict(sorted(contagem.items()))
+
+def calcular_probabilidades(num_dados, lados):
+    """
+    Calcula todas as combinações possíveis e suas probabilidades.
     
-    # Calcula a probabilidade de cada soma
-    total_combinacoes = len(todas_combinacoes)
-    probabilidades = {
+    Args:
+        num_dados: Quantidade de dados a serem jogados (inteiro > 0)
+        lados: Número de lados de cada dado (inteiro > 0)
+        
+    Returns:
+        Dicionário com somas possíveis e suas probabilidades
+        
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    return em_percentuais(contar_combinacoes(num_dados, lados))
+
+def em_percentuais(contagens):
+    """
+    Converte as contagens de contar_combinacoes() em probabilidades (%).
+    """
+    total_combinacoes = sum(contagens.values())
+    return {
         soma: (count / total_combinacoes) * 100 
-        for soma, count in sorted(contagem.items())
+        for soma, count in contagens.items()
     }
+
+def em_percentuais_acumulados(contagens):
+    """
+    Converte as contagens de contar_combinacoes() na distribuição acumulada (%).
+    
+    Cada valor é calculado a partir da contagem inteira acumulada, e não
+    somando as probabilidades em float: assim as fronteiras exatas
+    (ex: 50% em 1D6) não sofrem erro de arredondamento.
+    
+    Returns:
+        Lista com P(soma ≤ s) em %, na ordem das somas
+    """
+    total_combinacoes = sum(contagens.values())
+    acumuladas = []
+    acumulado = 0
+    for count in contagens.values():
+        acumulado += count
+        acumuladas.append((acumulado / total_combinacoes) * 100)
+    return acumuladas
+
+def calcular_probabilidades_convolucao(num_dados, lados):
+    """
+    Calcula as probabilidades exatas somando um dado por vez.
+    
+    Mantém só o vetor soma → combinações: cada novo dado soma, para cada
+    soma s, as combinações de s-lados até s-1 do vetor anterior, uma janela
+    móvel calculada por somas de prefixo. O custo é O(num_dados² · lados)
+    em vez de lados^num_dados, com o mesmo resultado de
+    calcular_probabilidades().
     
-    return probabilidades
+    Args:
+        num_dados: Quantidade de dados a serem jogados (inteiro > 0)
+        lados: Número de lados de cada dado (inteiro > 0)
+        
+    Returns:
+        Dicionário com somas possíveis e suas probabilidades
+        
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    validar_parametros(num_dados, lados)
+    
+    # contagens[i]: combinações com soma i + (dados já adicionados)
+    contagens = [1]
+    for _ in range(num_dados):
+        prefixo = [0, *accumulate(contagens)]
+        # Janela i: contagens[i - lados + 1 .. i], para i em 0..len+lados-2
+        altos = chain(islice(prefixo, 1, None), repeat(prefixo[-1], lados - 1))
+        baixos = chain(repeat(0, lados - 1), islice(prefixo, 0, len(contagens)))
+        contagens = list(map(sub, altos, baixos))
+    
+    # Direto do vetor, sem um dicionário intermediário de contagens
+    total_combinacoes = lados ** num_dados
+    return {
+        soma: (count / total_combinacoes) * 100
+        for soma, count in enumerate(contagens, start=num_dados)
+    }
 
-def simular_jogadas(num_dados, lados, num_jogadas):
+def calcular_probabilidades_aproximadas(num_dados, lados):
+    """
+    Aproxima as probabilidades pela distribuição normal.
+    
+    Pelo Teorema Central do Limite, a soma de muitos dados se aproxima de
+    uma normal com média n(L+1)/2 e variância n(L²-1)/12. O custo depende
+    só da quantidade de somas possíveis, não de L^n como no cálculo exato,
+    então serve para configurações grandes demais para enumerar.
+    
+    Args:
+        num_dados: Quantidade de dados a serem jogados (inteiro > 0)
+        lados: Número de lados de cada dado (inteiro > 0)
+        
+    Returns:
+        Dicionário com somas possíveis e suas probabilidades aproximadas
+        
+    Raises:
+        ValueError: Se os parâmetros não forem inteiros positivos
+    """
+    validar_parametros(num_dados, lados)
+    
+    media = num_dados * (lados + 1) / 2
+    desvio = math.sqrt(num_dados * (lados ** 2 - 1) / 12)
+    
+    # Um dado de um lado só: a soma é sempre num_dados
+    if desvio == 0:
+        return {num_dados: 100.0}
+    
+    def acumulada(x):
+        return 0.5 * (1 + math.erf((x - media) / (desvio * math.sqrt(2))))
+    
+    # Correção de continuidade: a soma s ocupa o intervalo [s - 0,5, s + 0,5]
+    somas = range(num_dados, num_dados * lados + 1)
+    massas = [acumulada(soma + 0.5) - acumulada(soma - 0.5) for soma in somas]
+    
+    # Normaliza para que o total seja exatamente 100%
+    total = sum(massas)
+    return {soma: (massa / total) * 100 for soma, massa in zip(somas, massas)}
+
+def agrupar_somas(valores, soma_minima, largura):
+    """
+    Agrupa somas consecutivas em faixas de `largura` somas.
+    
+    Usado para exibir configurações com muitas somas possíveis: cada faixa
+    é identificada pela sua primeira soma e recebe o total dos valores
+    (probabilidades ou contagens) das somas que contém.
+    
+    Ex: agrupar_somas({2: 1, 3: 2, 4: 3, 5: 4}, 2, 3) == {2: 6, 5: 4}
+    
+    Args:
+        valores: Dicionário ou Counter {soma: valor}
+        soma_minima: Menor soma possível (início da primeira faixa)
+        largura: Quantidade de somas por faixa (inteiro > 0)
+        
+    Returns:
+        Dicionário {primeira soma da faixa: total}, ordenado.
+        Com largura 1 devolve o próprio `valores`, sem cópia.
+    """
+    if largura == 1:
+        return valores
+    
+    faixas = {}
+    for soma, valor in sorted(valores.items()):
+        inicio = soma_minima + (soma - soma_minima) // largura * largura
+        faixas[inicio] = faixas.get(inicio, 0) + valor
+    return faixas
+
+def simular_jogadas(num_dados, lados, num_jogadas, gerador=None):
     """
     Simula as jogadas de dados e retorna os resultados.
     
@@ -56,17 +218,123 @@ def simular_jogadas(num_dados, lados, num_jogadas):
         num_dados: Quantidade de dados por jogada
         lados: Número de lados de cada dado
         num_jogadas: Quantidade de jogadas a simular
+        gerador: Gerador de dice_rng (ex: criar_gerador(semente=42)).
+            Se None, usa o gerador da thread atual (seguro com várias
+            threads). GERADOR_GLOBAL usa o módulo global random, que é
+            reproduzível com random.seed() mas não deve ser usado por
+            várias threads ao mesmo tempo.
+        
+    Returns:
+        Counter com a contagem de cada resultado
+    """
+    if not isinstance(num_jogadas, int):
+        raise ValueError("Número de jogadas deve ser um número inteiro")
+    
+    if gerador == GERADOR_GLOBAL:
+        resultados = []
+        
+        # Simula cada jogada
+        for _ in range(num_jogadas):
+            # Joga todos os dados e soma os resultados
+            jogada = sum(random.randint(1, lados) for _ in range(num_dados))
+            resultados.append(jogada)
+        
+        # Retorna a contagem de cada resultado
+        return Counter(resultados)
+    
+    if gerador is None:
+        gerador = gerador_da_thread()
+    
+    contagem = Counter()
+    restantes = num_jogadas
+    
+    # Gera em blocos para limitar a memória usada pelas faces sorteadas
+    while restantes > 0:
+        bloco = min(restantes, TAMANHO_BLOCO)
+        contagem.update(gerador.contar_somas(num_dados, lados, bloco))
+        restantes -= bloco
+    
+    return contagem
+
+def simular_jogadas_paralelo(num_dados, lados, num_jogadas, semente=None,
+                             num_threads=None, backend=BACKEND_PADRAO, executor=None):
+    """
+    Simula as jogadas em várias threads, de forma reproduzível.
+    
+    As jogadas são divididas em partes de TAMANHO_BLOCO, e a parte i usa
+    sempre o fluxo i do gerador. Não há estado compartilhado entre as
+    threads (as contagens só são somadas no final), então com a mesma
+    semente o resultado é idêntico para qualquer número de threads.
+    
+    Args:
+        num_dados: Quantidade de dados por jogada
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade de jogadas a simular
+        semente: Semente inteira (None sorteia uma)
+        num_threads: Quantidade de threads (None usa o padrão do executor)
+        backend: Backend de dice_rng usado em cada parte
+        executor: Executor já existente (se informado, num_threads é ignorado)
         
     Returns:
         Counter com a contagem de cada resultado
     """
-    resultados = []
+    if not isinstance(num_jogadas, int):
+        raise ValueError("Número de jogadas deve ser um número inteiro")
+    
+    # Tamanho de cada parte (a última pode ser menor)
+    inicios = range(0, num_jogadas, TAMANHO_BLOCO)
+    partes = (min(TAMANHO_BLOCO, num_jogadas - inicio) for inicio in inicios)
+    # Os geradores são criados conforme as partes são enviadas ao executor,
+    # então as primeiras threads começam sem esperar todos os fluxos
+    fluxos = iterar_fluxos(backend, semente, len(inicios))
+    
+    def simular_parte(gerador, quantidade):
+        return gerador.contar_somas(num_dados, lados, quantidade)
+    
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=num_threads) as executor_local:
+            contagens = list(executor_local.map(simular_parte, fluxos, partes))
+    else:
+        contagens = list(executor.map(simular_parte, fluxos, partes))
+    
+    # Junta as contagens parciais
+    contagem = Counter()
+    for parcial in contagens:
+        contagem.update(parcial)
+    return contagem
+
+def simular_jogadas_em_blocos(num_dados, lados, num_jogadas, gerador=None,
+                              tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Simula as jogadas em blocos, entregando o histograma parcial a cada bloco.
+    
+    Permite mostrar o progresso de simulações longas. O mesmo Counter é
+    atualizado e devolvido a cada passo, então o custo por bloco depende
+    apenas do tamanho do bloco, não do total de jogadas já feitas.
+    
+    Args:
+        num_dados: Quantidade de dados por jogada
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade total de jogadas
+        gerador: Gerador de dice_rng (None usa o gerador da thread atual)
+        tamanho_bloco: Quantidade de jogadas por bloco
+        
+    Yields:
+        Tupla (contagem acumulada, jogadas feitas até agora).
+        A contagem não deve ser alterada por quem consome o gerador.
+    """
+    if not isinstance(num_jogadas, int) or not isinstance(tamanho_bloco, int):
+        raise ValueError("Número de jogadas e tamanho do bloco devem ser inteiros")
+    if tamanho_bloco <= 0:
+        raise ValueError("Tamanho do bloco deve ser maior que zero")
     
-    # Simula cada jogada
-    for _ in range(num_jogadas):
-        # Joga todos os dados e soma os resultados
-        jogada = sum(random.randint(1, lados) for _ in range(num_dados))
-        resultados.append(jogada)
+    if gerador is None:
+        gerador = gerador_da_thread()
     
-    # Retorna a contagem de cada resultado
-    return Counter(resultados)
\ No newline at end of file
+    contagem = Counter()
+    feitas = 0
+    while feitas < num_jogadas:
+        bloco = min(tamanho_bloco, num_jogadas - feitas)
+        contagem.update(gerador.contar_somas(num_dados, lados, bloco))
+        feitas += bloco
+        yield contagem, feitas
@@ -0,0 +1,98 @@
+"""
+Módulo de acompanhamento de progresso para simulações longas.
+
+Calcula a velocidade (jogadas por segundo) e o tempo restante estimado,
+e limita a frequência de atualização da interface para que redesenhar o
+gráfico não custe mais que a própria simulação.
+"""
+
+import time
+
+# Intervalo mínimo entre atualizações da interface (10 por segundo)
+INTERVALO_PADRAO = 0.1
+
+
+class AcompanhamentoProgresso:
+    """
+    Acompanha uma simulação de `total` jogadas.
+
+    Exemplo:
+        progresso = AcompanhamentoProgresso(num_jogadas)
+        for contagem, feitas in simular_jogadas_em_blocos(...):
+            if progresso.registrar(feitas):
+                atualizar_tela(contagem, progresso.texto())
+    """
+
+    def __init__(self, total, intervalo_minimo=INTERVALO_PADRAO, relogio=time.monotonic,
+                 unidade="jogadas"):
+        """
+        Args:
+            total: Quantidade total de jogadas
+            intervalo_minimo: Segundos mínimos entre duas atualizações
+            relogio: Função que retorna o tempo atual em segundos
+            unidade: Nome da unidade exibida em texto() (ex: "execuções")
+        """
+        self.total = total
+        self.unidade = unidade
+        self.intervalo_minimo = intervalo_minimo
+        self._relogio = relogio
+        self._inicio = relogio()
+        self._ultima_atualizacao = None
+        self.feitas = 0
+
+    def registrar(self, feitas):
+        """
+        Registra o progresso atual.
+
+        Args:
+            feitas: Quantidade de jogadas concluídas até agora
+
+        Returns:
+            True se a interface deve ser atualizada agora. A primeira e a
+            última chamada sempre retornam True; as demais respeitam o
+            intervalo mínimo.
+        """
+        self.feitas = feitas
+        agora = self._relogio()
+
+        if (
+            feitas >= self.total
+            or self._ultima_atualizacao is None
+            or agora - self._ultima_atualizacao >= self.intervalo_minimo
+        ):
+            self._ultima_atualizacao = agora
+            return True
+        return False
+
+    @property
+    def jogadas_por_segundo(self):
+        """Velocidade média desde o início (0 se ainda não há medição)."""
+        decorrido = self._relogio() - self._inicio
+        if decorrido <= 0:
+            return 0.0
+        return self.feitas / decorrido
+
+    @property
+    def segundos_restantes(self):
+        """Tempo restante estimado, ou None se ainda não é possível estimar."""
+        velocidade = self.jogadas_por_segundo
+        if velocidade <= 0:
+            return None
+        return (self.total - self.feitas) / velocidade
+
+    def texto(self):
+        """
+        Retorna um resumo para exibir na interface.
+
+        Ex: "45% · 1.234.567 jogadas/s · restam 3s"
+        """
+        percentual = (self.feitas / self.total) * 100 if self.total else 100.0
+        velocidade = f"{self.jogadas_por_segundo:,.0f}".replace(",", ".")
+
+        restante = self.segundos_restantes
+        if restante is None:
+            estimativa = "calculando..."
+        else:
+            estimativa = f"restam {restante:.0f}s"
+
+        return f"{percentual:.0f}% · {velocidade} {self.unidade}/s · {estimativa}"
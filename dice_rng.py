@@ -0,0 +1,466 @@
+"""
+Módulo com geradores de números aleatórios para a simulação de jogadas.
+
+Cada gerador guarda seu próprio estado (nada de estado global compartilhado),
+recebe semente e fluxo explícitos e gera inteiros em lote, sem viés de
+módulo (amostragem por rejeição). Fluxos diferentes com a mesma semente
+nunca se sobrepõem quando o backend suporta salto (jump-ahead).
+
+Um gerador não deve ser usado por várias threads ao mesmo tempo: para uso
+concorrente, crie um gerador por chamada, use gerador_da_thread() ou
+distribua fluxos independentes com criar_fluxos() ou iterar_fluxos().
+
+Backends disponíveis:
+    "xoshiro"  - xoshiro256** em Python puro, com salto de 2^128 passos
+    "mersenne" - random.Random (Mersenne Twister) com instância própria
+    "pcg64"    - PCG64 do NumPy (opcional, exige numpy instalado)
+
+O padrão (BACKEND_PADRAO) é o mais rápido disponível: "pcg64" com NumPy,
+senão "mersenne". O "xoshiro" é bem mais lento; use-o quando for preciso
+garantir fluxos sem sobreposição sem depender do NumPy.
+"""
+
+import copy
+import importlib.util
+import os
+import threading
+from collections import Counter
+import random
+
+_MASCARA_64 = (1 << 64) - 1
+
+# Polinômio de salto do xoshiro256** (equivale a 2^128 chamadas de proximo())
+_SALTO_XOSHIRO = (
+    0x180EC6D33CFD0ABA,
+    0xD5A61266F0C9392C,
+    0xA9582618E03FC9AA,
+    0x39ABDC4529B1661C,
+)
+
+
+def _semente_aleatoria():
+    """Gera uma semente de 64 bits a partir da entropia do sistema."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+def _validar_semente(semente, fluxo):
+    """
+    Valida semente e fluxo, sorteando uma semente quando for None.
+
+    Returns:
+        Semente inteira a ser usada pelo gerador
+    """
+    if semente is None:
+        semente = _semente_aleatoria()
+    if not isinstance(semente, int) or not isinstance(fluxo, int):
+        raise ValueError("Semente e fluxo devem ser números inteiros")
+    if semente < 0 or fluxo < 0:
+        raise ValueError("Semente e fluxo não podem ser negativos")
+    return semente
+
+
+def _validar_limite(limite, quantidade):
+    """Valida os argumentos de inteiros()."""
+    if not isinstance(limite, int) or not isinstance(quantidade, int):
+        raise ValueError("Limite e quantidade devem ser números inteiros")
+    if limite <= 0 or limite > (1 << 64):
+        raise ValueError("Limite deve estar entre 1 e 2^64")
+    if quantidade < 0:
+        raise ValueError("Quantidade não pode ser negativa")
+
+
+class GeradorBase:
+    """
+    Interface comum dos geradores usados por simular_jogadas().
+
+    As subclasses implementam inteiros(); contar_somas() tem uma versão
+    genérica que pode ser substituída por uma mais rápida.
+    """
+
+    def inteiros(self, limite, quantidade):
+        """
+        Gera inteiros uniformes no intervalo [0, limite).
+
+        Args:
+            limite: Limite superior exclusivo (1 ≤ limite ≤ 2^64)
+            quantidade: Quantidade de números a gerar
+
+        Returns:
+            Sequência com os números gerados
+        """
+        raise NotImplementedError
+
+    def contar_somas(self, num_dados, lados, quantidade):
+        """
+        Joga `quantidade` vezes `num_dados` dados e conta cada soma.
+
+        Args:
+            num_dados: Quantidade de dados por jogada
+            lados: Número de lados de cada dado
+            quantidade: Quantidade de jogadas
+
+        Returns:
+            Counter com a contagem de cada soma
+        """
+        faces = self.inteiros(lados, num_dados * quantidade)
+
+        # Agrupa as faces de num_dados em num_dados (uma jogada por grupo)
+        # As faces vêm em [0, lados), então cada soma é deslocada por num_dados
+        grupos = zip(*[iter(faces)] * num_dados)
+        contagem = Counter(map(sum, grupos))
+        return Counter({soma + num_dados: count for soma, count in contagem.items()})
+
+
+class GeradorXoshiro(GeradorBase):
+    """
+    Gerador xoshiro256** em Python puro.
+
+    O estado inicial é derivado da semente com splitmix64; cada fluxo é o
+    fluxo 0 avançado `fluxo` vezes por saltar(), ou seja, fluxos distintos
+    ficam separados por 2^128 números e nunca se sobrepõem.
+
+    Cada saltar() custa cerca de 0,5 ms. Fluxos a partir de
+    _SALTOS_DIRETOS_MAX usam as potências da matriz de salto, calculadas
+    uma vez por processo (cerca de 0,2 s), e então custam O(log fluxo).
+    Para percorrer muitos fluxos em sequência, use iterar_fluxos().
+    """
+
+    def __init__(self, semente=None, fluxo=0):
+        """
+        Args:
+            semente: Inteiro não negativo (None usa entropia do sistema)
+            fluxo: Índice do fluxo independente (inteiro ≥ 0)
+        """
+        semente = _validar_semente(semente, fluxo)
+
+        # splitmix64 espalha a semente pelos 256 bits de estado
+        x = semente & _MASCARA_64
+        estado = []
+        for _ in range(4):
+            x = (x + 0x9E3779B97F4A7C15) & _MASCARA_64
+            z = x
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA_64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA_64
+            estado.append(z ^ (z >> 31))
+        self._s = estado
+
+        if fluxo < _SALTOS_DIRETOS_MAX:
+            for _ in range(fluxo):
+                self.saltar()
+        else:
+            self._s = _saltar_varios(estado, fluxo)
+
+    def proximo(self):
+        """Retorna o próximo número de 64 bits da sequência."""
+        s0, s1, s2, s3 = self._s
+        # resultado = rotl(s1 * 5, 7) * 9
+        x = (s1 * 5) & _MASCARA_64
+        resultado = ((((x << 7) | (x >> 57)) & _MASCARA_64) * 9) & _MASCARA_64
+
+        t = (s1 << 17) & _MASCARA_64
+        s2 ^= s0
+        s3 ^= s1
+        s1 ^= s2
+        s0 ^= s3
+        s2 ^= t
+        s3 = ((s3 << 45) | (s3 >> 19)) & _MASCARA_64
+
+        self._s = [s0, s1, s2, s3]
+        return resultado
+
+    def saltar(self):
+        """Avança o estado em 2^128 passos (início do próximo fluxo)."""
+        novo = [0, 0, 0, 0]
+        for palavra in _SALTO_XOSHIRO:
+            for bit in range(64):
+                if palavra & (1 << bit):
+                    novo = [a ^ b for a, b in zip(novo, self._s)]
+                self.proximo()
+        self._s = novo
+
+    def inteiros(self, limite, quantidade):
+        """
+        Gera inteiros em [0, limite) pelo método de Lemire.
+
+        Multiplica o número de 64 bits pelo limite e usa a parte alta;
+        os poucos valores que causariam viés são rejeitados e sorteados
+        novamente.
+        """
+        _validar_limite(limite, quantidade)
+
+        # Valores da parte baixa abaixo deste limiar geram viés
+        limiar = ((1 << 64) - limite) % limite
+        proximo = self.proximo
+
+        resultados = []
+        for _ in range(quantidade):
+            m = proximo() * limite
+            while (m & _MASCARA_64) < limiar:
+                m = proximo() * limite
+            resultados.append(m >> 64)
+        return resultados
+
+
+# Acima desta quantidade de saltos, o fluxo é calculado pelas potências
+# da matriz de salto, em O(log fluxo) em vez de um saltar() por fluxo
+_SALTOS_DIRETOS_MAX = 256
+
+# _POTENCIAS_SALTO[k]: colunas da matriz (sobre GF(2)) de 2^k saltos,
+# calculadas sob demanda e compartilhadas por todas as sementes
+_POTENCIAS_SALTO = []
+_trava_potencias = threading.Lock()
+
+
+def _estado_em_inteiro(estado):
+    """Junta as 4 palavras de 64 bits do estado em um inteiro de 256 bits."""
+    return estado[0] | estado[1] << 64 | estado[2] << 128 | estado[3] << 192
+
+
+def _inteiro_em_estado(valor):
+    """Inverso de _estado_em_inteiro()."""
+    return [(valor >> deslocamento) & _MASCARA_64 for deslocamento in (0, 64, 128, 192)]
+
+
+def _aplicar_matriz(colunas, valor):
+    """Multiplica a matriz (lista de 256 colunas) pelo vetor de bits `valor`."""
+    resultado = 0
+    for coluna in colunas:
+        if valor & 1:
+            resultado ^= coluna
+        valor >>= 1
+        if not valor:
+            break
+    return resultado
+
+
+def _potencia_salto(k):
+    """Retorna as colunas da matriz de 2^k saltos, calculando se preciso."""
+    with _trava_potencias:
+        if not _POTENCIAS_SALTO:
+            # O salto é linear sobre GF(2): a coluna i é o salto do vetor e_i
+            colunas = []
+            gerador = GeradorXoshiro.__new__(GeradorXoshiro)
+            for i in range(256):
+                gerador._s = _inteiro_em_estado(1 << i)
+                gerador.saltar()
+                colunas.append(_estado_em_inteiro(gerador._s))
+            _POTENCIAS_SALTO.append(colunas)
+        while len(_POTENCIAS_SALTO) <= k:
+            # M^(2^(k+1)) = M^(2^k) · M^(2^k)
+            anterior = _POTENCIAS_SALTO[-1]
+            _POTENCIAS_SALTO.append([_aplicar_matriz(anterior, coluna) for coluna in anterior])
+        return _POTENCIAS_SALTO[k]
+
+
+def _saltar_varios(estado, quantidade):
+    """Aplica `quantidade` saltos ao estado, um por bit de `quantidade`."""
+    valor = _estado_em_inteiro(estado)
+    for k in range(quantidade.bit_length()):
+        if quantidade >> k & 1:
+            valor = _aplicar_matriz(_potencia_salto(k), valor)
+    return _inteiro_em_estado(valor)
+
+
+class GeradorMersenne(GeradorBase):
+    """
+    Gerador baseado em uma instância própria de random.Random.
+
+    O Mersenne Twister não oferece salto, então cada fluxo é semeado
+    separadamente a partir de (semente, fluxo). A chance de sobreposição
+    entre fluxos é desprezível, mas não é garantida como no xoshiro.
+    """
+
+    def __init__(self, semente=None, fluxo=0):
+        """
+        Args:
+            semente: Inteiro não negativo (None usa entropia do sistema)
+            fluxo: Índice do fluxo independente (inteiro ≥ 0)
+        """
+        semente = _validar_semente(semente, fluxo)
+
+        # Sementes em texto passam por SHA-512 no random.Random
+        self._random = random.Random(f"{semente}:{fluxo}")
+
+    def inteiros(self, limite, quantidade):
+        """
+        Gera inteiros em [0, limite) sorteando bits e rejeitando excedentes.
+        """
+        _validar_limite(limite, quantidade)
+
+        bits = limite.bit_length()
+        # Para potências de 2 não há rejeição: basta usar um bit a menos
+        if limite & (limite - 1) == 0:
+            bits -= 1
+            if bits == 0:
+                return [0] * quantidade
+
+        getrandbits = self._random.getrandbits
+        resultados = []
+        for _ in range(quantidade):
+            r = getrandbits(bits)
+            while r >= limite:
+                r = getrandbits(bits)
+            resultados.append(r)
+        return resultados
+
+
+class GeradorPCG64(GeradorBase):
+    """
+    Gerador PCG64 do NumPy, com geração vetorizada.
+
+    Cada fluxo é o gerador base avançado com PCG64.jumped(fluxo),
+    o que garante fluxos sem sobreposição.
+    """
+
+    def __init__(self, semente=None, fluxo=0):
+        """
+        Args:
+            semente: Inteiro não negativo (None usa entropia do sistema)
+            fluxo: Índice do fluxo independente (inteiro ≥ 0)
+
+        Raises:
+            ImportError: Se o NumPy não estiver instalado
+        """
+        try:
+            import numpy
+        except ImportError as error:
+            raise ImportError("O backend 'pcg64' requer o pacote numpy") from error
+
+        semente = _validar_semente(semente, fluxo)
+
+        self._np = numpy
+        bit_generator = numpy.random.PCG64(semente)
+        if fluxo:
+            bit_generator = bit_generator.jumped(fluxo)
+        self._gerador = numpy.random.Generator(bit_generator)
+
+    def inteiros(self, limite, quantidade):
+        """
+        Gera inteiros em [0, limite) com o método de Lemire do NumPy.
+        """
+        _validar_limite(limite, quantidade)
+        return self._gerador.integers(0, limite, size=quantidade, dtype=self._np.uint64)
+
+    def contar_somas(self, num_dados, lados, quantidade):
+        """
+        Versão vetorizada: soma por linha e conta com bincount.
+        """
+        faces = self._gerador.integers(1, lados + 1, size=(quantidade, num_dados))
+        contagem = self._np.bincount(faces.sum(axis=1))
+        return Counter({
+            int(soma): int(count)
+            for soma, count in enumerate(contagem.tolist())
+            if count
+        })
+
+
+# Backends registrados por nome
+BACKENDS = {
+    "xoshiro": GeradorXoshiro,
+    "mersenne": GeradorMersenne,
+    "pcg64": GeradorPCG64,
+}
+
+# Backend mais rápido disponível nesta instalação
+BACKEND_PADRAO = "pcg64" if importlib.util.find_spec("numpy") is not None else "mersenne"
+
+
+def criar_gerador(backend=BACKEND_PADRAO, semente=None, fluxo=0):
+    """
+    Cria um gerador pelo nome do backend.
+
+    Args:
+        backend: Nome do backend ("xoshiro", "mersenne" ou "pcg64");
+            o padrão é BACKEND_PADRAO
+        semente: Semente inteira (None usa entropia do sistema)
+        fluxo: Índice do fluxo independente
+
+    Returns:
+        Instância de GeradorBase
+
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend!r}")
+    return BACKENDS[backend](semente, fluxo)
+
+
+def iterar_fluxos(backend=BACKEND_PADRAO, semente=None, quantidade=1):
+    """
+    Gera, um de cada vez, vários geradores independentes de uma única semente.
+
+    O gerador de índice i é equivalente a criar_gerador(backend, semente, i),
+    então o resultado não depende de quantas threads vão consumir os fluxos.
+    Cada gerador só é criado quando pedido, então a memória não cresce com
+    a quantidade de fluxos.
+
+    Args:
+        backend: Nome do backend
+        semente: Semente inteira (None sorteia uma única semente para todos)
+        quantidade: Quantidade de fluxos
+
+    Returns:
+        Iterador com um gerador por fluxo, na ordem dos índices
+
+    Raises:
+        ValueError: Se o backend ou a semente forem inválidos
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {backend!r}")
+    semente = _validar_semente(semente, 0)
+    return _iterar_fluxos(backend, semente, quantidade)
+
+
+def _iterar_fluxos(backend, semente, quantidade):
+    """Corpo de iterar_fluxos(), separado para validar os argumentos na chamada."""
+    if backend != "xoshiro":
+        for fluxo in range(quantidade):
+            yield BACKENDS[backend](semente, fluxo)
+        return
+
+    # No xoshiro cada fluxo é o anterior mais um salto; copiar e saltar
+    # evita refazer todos os saltos desde o fluxo 0 a cada gerador
+    gerador = GeradorXoshiro(semente)
+    for _ in range(quantidade):
+        yield copy.deepcopy(gerador)
+        gerador.saltar()
+
+
+def criar_fluxos(backend=BACKEND_PADRAO, semente=None, quantidade=1):
+    """
+    Cria vários geradores independentes a partir de uma única semente.
+
+    Igual a iterar_fluxos(), mas devolve todos os geradores de uma vez.
+
+    Returns:
+        Lista de geradores, um por fluxo
+    """
+    return list(iterar_fluxos(backend, semente, quantidade))
+
+
+# Um gerador por thread, criado na primeira chamada de cada thread
+_local = threading.local()
+
+
+def gerador_da_thread(backend=BACKEND_PADRAO):
+    """
+    Retorna o gerador exclusivo da thread atual.
+
+    Útil para chamar simular_jogadas() de várias threads sem disputar o
+    estado global do módulo random. Cada thread recebe uma semente própria
+    do sistema, portanto o resultado não é reproduzível; para isso use
+    criar_gerador() com semente explícita.
+
+    Args:
+        backend: Nome do backend usado na primeira chamada da thread
+
+    Returns:
+        Instância de GeradorBase da thread atual
+    """
+    geradores = getattr(_local, "geradores", None)
+    if geradores is None:
+        geradores = _local.geradores = {}
+    if backend not in geradores:
+        geradores[backend] = criar_gerador(backend)
+    return geradores[backend]
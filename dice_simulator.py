@@ -1,7 +1,23 @@
 import flet as ft
-from dice_logic import calcular_probabilidades, simular_jogadas
+from dice_logic import (
+    agrupar_somas,
+    calcular_probabilidades,
+    calcular_probabilidades_aproximadas,
+    calcular_probabilidades_convolucao,
+    simular_jogadas,
+    simular_jogadas_em_blocos,
+)
+from dice_admissao import avaliar_pedido
+from dice_comparacao import AgregadorExecucoes
+from dice_progresso import AcompanhamentoProgresso
+from dice_bundle import PacoteAquecimento
+from dice_rng import criar_gerador, iterar_fluxos
 from collections import Counter
 
+# Pacote com as configurações populares pré-calculadas
+# Compartilhado por todas as sessões; o arquivo só é aberto no primeiro uso
+pacote = PacoteAquecimento()
+
 def main(page: ft.Page):
     """
     Função principal do aplicativo Flet.
@@ -12,6 +28,10 @@ def main(page: ft.Page):
     page.padding = 20
     page.scroll = "adaptive"  # Permite scroll quando necessário
     
+    # Gerador aleatório exclusivo desta sessão
+    # Evita que várias sessões disputem o estado global do módulo random
+    gerador = criar_gerador()
+    
     # Variável para armazenar o gráfico atual
     chart_container = ft.Column()
     
@@ -46,14 +66,34 @@ def main(page: ft.Page):
         )
         page.update()
     
-    def criar_grafico(resultados_simulacao, probabilidades_teoricas, num_jogadas):
+    # Estado do gráfico atual (gráfico, barras por soma e probabilidades)
+    # Usado para atualizar as barras sem recriar o gráfico
+    grafico_atual = {}
+    
+    # Agrupamento das somas exibidas, decidido pelo controle de admissão
+    # (largura 1 mostra cada soma; largura > 1 mostra faixas de somas)
+    exibicao = {"largura": 1, "soma_maxima": 0}
+    
+    def rotulo_soma(soma):
+        """
+        Retorna o texto de uma soma ou da faixa de somas que começa nela.
+        """
+        if exibicao["largura"] == 1:
+            return str(soma)
+        fim = min(soma + exibicao["largura"] - 1, exibicao["soma_maxima"])
+        return f"{soma} a {fim}"
+    
+    def criar_grafico(resultados_simulacao, probabilidades_teoricas, num_jogadas, banda=None):
         """
         Cria um gráfico de barras com os resultados da simulação.
         
         Args:
             resultados_simulacao: Counter com resultados da simulação
             probabilidades_teoricas: Dicionário com probabilidades teóricas
+                (agrupadas em faixas, se exibicao["largura"] > 1)
             num_jogadas: Número total de jogadas simuladas
+            banda: Dicionário opcional soma → (inferior, superior) com a faixa
+                de frequências de várias execuções, desenhada ao lado de cada barra
         """
         # Limpa o container anterior
         chart_container.controls.clear()
@@ -62,40 +102,42 @@ def main(page: ft.Page):
         todos_valores = sorted(set(list(probabilidades_teoricas.keys()) + 
                                   list(resultados_simulacao.keys())))
         
-        # Prepara os dados para o gráfico
-        # Cada barra terá a frequência simulada
+        # Cria uma barra para cada valor possível
+        # As alturas e tooltips são preenchidas por atualizar_grafico()
+        barras = {}
         bar_groups = []
         
         for valor in todos_valores:
-            count = resultados_simulacao.get(valor, 0)
-            probabilidade_teorica = probabilidades_teoricas.get(valor, 0)
+            barras[valor] = ft.BarChartRod(
+                from_y=0,
+                to_y=0,
+                width=20,
+                color=ft.Colors.BLUE_400,
+                border_radius=5,
+            )
+            rods = [barras[valor]]
             
-            # Calcula a frequência esperada baseada na probabilidade teórica
-            frequencia_esperada = (probabilidade_teorica / 100) * num_jogadas
+            # Faixa de variação entre execuções (modo de comparação)
+            if banda and valor in banda:
+                inferior, superior = banda[valor]
+                rods.append(
+                    ft.BarChartRod(
+                        from_y=inferior,
+                        to_y=superior,
+                        width=8,
+                        color=ft.Colors.with_opacity(0.6, ft.Colors.ORANGE_400),
+                        tooltip=f"Faixa de 95%: {inferior:.1f} a {superior:.1f}",
+                        border_radius=2,
+                    )
+                )
             
-            # Cria a barra com tooltip mostrando informações detalhadas
             bar_groups.append(
                 ft.BarChartGroup(
                     x=valor,
-                    bar_rods=[
-                        ft.BarChartRod(
-                            from_y=0,
-                            to_y=count,
-                            width=20,
-                            color=ft.Colors.BLUE_400,
-                            tooltip=f"Soma: {valor}\n"
-                                   f"Frequência: {count}\n"
-                                   f"Esperado: {frequencia_esperada:.1f}\n"
-                                   f"Prob. Teórica: {probabilidade_teorica:.2f}%",
-                            border_radius=5,
-                        ),
-                    ],
+                    bar_rods=rods,
                 )
             )
         
-        # Encontra o valor máximo para ajustar o eixo Y
-        max_y = max(resultados_simulacao.values()) if resultados_simulacao else 10
-        
         # Cria o gráfico de barras
         chart = ft.BarChart(
             bar_groups=bar_groups,
@@ -111,16 +153,24 @@ def main(page: ft.Page):
                 title_size=16,
             ),
             horizontal_grid_lines=ft.ChartGridLines(
-                interval=max(1, max_y // 10),
                 color=ft.Colors.GREY_300,
                 width=1,
             ),
             tooltip_bgcolor=ft.Colors.with_opacity(0.8, ft.Colors.GREY_800),
-            max_y=max_y * 1.1,  # Adiciona 10% de margem superior
             interactive=True,
             expand=True,
         )
         
+        grafico_atual.update(
+            chart=chart,
+            barras=barras,
+            probabilidades=probabilidades_teoricas,
+            banda=banda or {},
+        )
+        
+        # Preenche as barras com os resultados
+        atualizar_grafico(resultados_simulacao, num_jogadas)
+        
         # Adiciona o gráfico ao container
         chart_container.controls.append(
             ft.Container(
@@ -132,6 +182,44 @@ def main(page: ft.Page):
         
         page.update()
     
+    def atualizar_grafico(resultados_simulacao, num_jogadas):
+        """
+        Atualiza as barras do gráfico atual com novos resultados.
+        
+        Altera apenas os valores das barras já existentes, então o custo
+        depende do número de somas possíveis, e não do número de jogadas.
+        Não chama page.update(); isso fica a cargo de quem chama.
+        
+        Args:
+            resultados_simulacao: Counter com resultados (parciais ou finais),
+                agrupado da mesma forma que as probabilidades do gráfico
+            num_jogadas: Número de jogadas já simuladas
+        """
+        probabilidades_teoricas = grafico_atual["probabilidades"]
+        
+        for valor, barra in grafico_atual["barras"].items():
+            count = resultados_simulacao.get(valor, 0)
+            probabilidade_teorica = probabilidades_teoricas.get(valor, 0)
+            
+            # Calcula a frequência esperada baseada na probabilidade teórica
+            frequencia_esperada = (probabilidade_teorica / 100) * num_jogadas
+            
+            # Atualiza a barra com tooltip mostrando informações detalhadas
+            barra.to_y = count
+            barra.tooltip = (f"Soma: {rotulo_soma(valor)}\n"
+                             f"Frequência: {count}\n"
+                             f"Esperado: {frequencia_esperada:.1f}\n"
+                             f"Prob. Teórica: {probabilidade_teorica:.2f}%")
+        
+        # Encontra o valor máximo para ajustar o eixo Y (incluindo a faixa, se houver)
+        max_y = max(resultados_simulacao.values()) if resultados_simulacao else 10
+        if grafico_atual["banda"]:
+            max_y = max(max_y, max(superior for _, superior in grafico_atual["banda"].values()))
+        
+        chart = grafico_atual["chart"]
+        chart.horizontal_grid_lines.interval = max(1, max_y // 10)
+        chart.max_y = max_y * 1.1  # Adiciona 10% de margem superior
+    
     def mostrar_probabilidades(probabilidades):
         """
         Exibe a tabela de probabilidades teóricas.
@@ -153,7 +241,7 @@ def main(page: ft.Page):
             rows.append(
                 ft.DataRow(
                     cells=[
-                        ft.DataCell(ft.Text(str(soma))),
+                        ft.DataCell(ft.Text(rotulo_soma(soma))),
                         ft.DataCell(ft.Text(f"{prob:.4f}%")),
                         # Barra visual da probabilidade
                         ft.DataCell(
@@ -193,51 +281,120 @@ def main(page: ft.Page):
             num_dados = int(input_num_dados.value)
             lados = int(input_lados.value)
             num_jogadas = int(input_num_jogadas.value)
+            num_execucoes = int(input_num_execucoes.value)
             
             # Validações básicas
-            if num_dados <= 0 or lados <= 0 or num_jogadas <= 0:
+            if num_dados <= 0 or lados <= 0 or num_jogadas <= 0 or num_execucoes <= 0:
                 raise ValueError("Todos os valores devem ser maiores que zero")
             
-            if num_dados > 10:
-                raise ValueError("Máximo de 10 dados permitido (desempenho)")
+            # Estima o custo do pedido e decide se roda, como roda ou se é recusado
+            # No modo de comparação o custo inclui todas as execuções
+            decisao = avaliar_pedido(
+                num_dados, lados, num_jogadas,
+                exato_disponivel=(num_dados, lados) in pacote,
+                num_execucoes=num_execucoes,
+            )
+            if decisao.acao == "rejeitar":
+                raise ValueError(decisao.mensagem)
+            
+            # Configurações com muitas somas são exibidas em faixas
+            largura = decisao.agrupamento
+            exibicao.update(largura=largura, soma_maxima=num_dados * lados)
             
-            if lados > 100:
-                raise ValueError("Máximo de 100 lados permitido")
-                
-            if num_jogadas > 100000:
-                raise ValueError("Máximo de 100.000 jogadas permitido")
+            def agrupar(valores):
+                return agrupar_somas(valores, num_dados, largura)
             
             # Mostra indicador de carregamento
             progress_ring.visible = True
             btn_simular.disabled = True
             page.update()
             
-            # Calcula as probabilidades teóricas
-            probabilidades = calcular_probabilidades(num_dados, lados)
-            mostrar_probabilidades(probabilidades)
-            
-            # Executa a simulação
-            resultados = simular_jogadas(num_dados, lados, num_jogadas)
+            # Obtém as probabilidades teóricas: do pacote pré-calculado,
+            # calculadas na hora (enumeração ou convolução) ou aproximadas
+            # (configurações com muitos dados, grandes demais para o exato)
+            if decisao.motor_exato == "aproximacao":
+                probabilidades = calcular_probabilidades_aproximadas(num_dados, lados)
+            elif decisao.motor_exato == "convolucao":
+                probabilidades = calcular_probabilidades_convolucao(num_dados, lados)
+            else:
+                probabilidades = pacote.probabilidades(num_dados, lados)
+            probabilidades_exibidas = agrupar(probabilidades)
+            mostrar_probabilidades(probabilidades_exibidas)
             
-            # Cria o gráfico com os resultados
-            criar_grafico(resultados, probabilidades, num_jogadas)
+            if num_execucoes > 1:
+                # Modo de comparação: várias execuções independentes,
+                # mostrando a média de cada soma e a faixa entre as execuções
+                agregador = AgregadorExecucoes(num_dados, lados, probabilidades, largura=largura)
+                progresso = AcompanhamentoProgresso(num_execucoes, unidade="execuções")
+                texto_progresso.visible = True
+                
+                # Os geradores são criados um por vez, conforme as execuções rodam
+                for feitas, gerador_execucao in enumerate(
+                    iterar_fluxos(quantidade=num_execucoes), start=1
+                ):
+                    agregador.adicionar(
+                        simular_jogadas(num_dados, lados, num_jogadas, gerador=gerador_execucao)
+                    )
+                    if progresso.registrar(feitas):
+                        texto_progresso.value = progresso.texto()
+                        page.update()
+                
+                # Converte as estatísticas (em %) para frequências
+                resumo = agregador.estatisticas()
+                medias = {
+                    item.soma: round(item.media / 100 * num_jogadas, 1) for item in resumo
+                }
+                banda = {
+                    item.soma: (item.inferior / 100 * num_jogadas, item.superior / 100 * num_jogadas)
+                    for item in resumo
+                }
+                criar_grafico(medias, probabilidades_exibidas, num_jogadas, banda=banda)
+            elif decisao.motor_simulacao == "simulacao_em_blocos":
+                # Cria o gráfico vazio e executa a simulação em blocos,
+                # atualizando o gráfico no máximo 10 vezes por segundo
+                criar_grafico(Counter(), probabilidades_exibidas, num_jogadas)
+                progresso = AcompanhamentoProgresso(num_jogadas)
+                texto_progresso.visible = True
+                
+                for resultados, feitas in simular_jogadas_em_blocos(
+                    num_dados, lados, num_jogadas, gerador=gerador
+                ):
+                    if progresso.registrar(feitas):
+                        atualizar_grafico(agrupar(resultados), feitas)
+                        texto_progresso.value = progresso.texto()
+                        page.update()
+            else:
+                # Simulação rápida: executa de uma vez e cria o gráfico
+                resultados = simular_jogadas(num_dados, lados, num_jogadas, gerador=gerador)
+                criar_grafico(agrupar(resultados), probabilidades_exibidas, num_jogadas)
             
             # Prepara mudanças finais
             progress_ring.visible = False
+            texto_progresso.visible = False
             btn_simular.disabled = False
             page.update()  # Atualiza o estado dos controles
             
             # Mostra mensagem de sucesso (3 segundos)
-            mostrar_mensagem(
-                "Simulação concluída com sucesso!",
-                sucesso=True,
-                duracao=3000,
-                mostrar_fechar=False
-            )
+            # Se o pedido foi reduzido, explica o que mudou (7 segundos)
+            if decisao.acao == "reduzir":
+                mostrar_mensagem(
+                    f"Simulação concluída. {decisao.mensagem}",
+                    sucesso=True,
+                    duracao=7000,
+                    mostrar_fechar=True
+                )
+            else:
+                mostrar_mensagem(
+                    "Simulação concluída com sucesso!",
+                    sucesso=True,
+                    duracao=3000,
+                    mostrar_fechar=False
+                )
             
         except ValueError as error:
             # Prepara mudanças para erro
             progress_ring.visible = False
+            texto_progresso.visible = False
             btn_simular.disabled = False
             page.update()  # Atualiza o estado dos controles
             
@@ -278,6 +435,15 @@ def main(page: ft.Page):
         width=250,
     )
     
+    # Campo de entrada: Número de execuções (mais de 1 ativa o modo de comparação)
+    input_num_execucoes = ft.TextField(
+        label="Execuções",
+        hint_text="Ex: 100 (compara execuções)",
+        value="1",
+        keyboard_type=ft.KeyboardType.NUMBER,
+        width=250,
+    )
+    
     def on_sair_click(e):
         """
         Função chamada quando o botão 'Sair' é clicado.
@@ -310,6 +476,9 @@ def main(page: ft.Page):
     # Indicador de carregamento
     progress_ring = ft.ProgressRing(visible=False)
     
+    # Velocidade e tempo restante durante simulações longas
+    texto_progresso = ft.Text(visible=False, size=12, color=ft.Colors.GREY_700)
+    
     # Layout responsivo usando Column e Row
     # Column organiza os elementos verticalmente
     # Row organiza os elementos horizontalmente
@@ -338,9 +507,10 @@ def main(page: ft.Page):
                                 # Usa Row para inputs em tela grande, Column em tela pequena
                                 ft.ResponsiveRow(
                                     controls=[
-                                        ft.Container(input_num_dados, col={"sm": 12, "md": 4}),
-                                        ft.Container(input_lados, col={"sm": 12, "md": 4}),
-                                        ft.Container(input_num_jogadas, col={"sm": 12, "md": 4}),
+                                        ft.Container(input_num_dados, col={"sm": 12, "md": 3}),
+                                        ft.Container(input_lados, col={"sm": 12, "md": 3}),
+                                        ft.Container(input_num_jogadas, col={"sm": 12, "md": 3}),
+                                        ft.Container(input_num_execucoes, col={"sm": 12, "md": 3}),
                                     ],
                                 ),
                                 ft.Row(
@@ -352,6 +522,7 @@ def main(page: ft.Page):
                                     ],
                                     alignment=ft.MainAxisAlignment.CENTER,
                                 ),
+                                texto_progresso,
                             ],
                             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                         ),
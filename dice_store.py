@@ -0,0 +1,276 @@
+"""
+Módulo de armazenamento em disco de tabelas de probabilidades pré-calculadas.
+
+Guarda muitos resultados de calcular_probabilidades() em um único arquivo
+binário contíguo, com um índice no cabeçalho. A leitura usa mmap, então as
+tabelas são acessadas sem cópia e vários processos compartilham as mesmas
+páginas de memória do sistema operacional.
+
+Formato do arquivo (little-endian):
+    Cabeçalho (16 bytes): assinatura b"DLPT", versão, flags, nº de entradas
+    Índice (24 bytes por entrada): num_dados, lados, soma mínima,
+        quantidade de somas e deslocamento (em bytes) dos dados
+    Dados: vetores float64 com as probabilidades (%) de cada soma,
+        da soma mínima até a máxima. Com a flag FLAG_ACUMULADAS, cada
+        vetor é seguido da distribuição acumulada (%) da mesma tabela.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from dice_logic import contar_combinacoes, em_percentuais, em_percentuais_acumulados
+
+ASSINATURA = b"DLPT"
+VERSAO = 1
+
+# Flags do cabeçalho
+FLAG_ACUMULADAS = 1
+
+# Estruturas binárias do cabeçalho e de cada entrada do índice
+_CABECALHO = struct.Struct("<4sHHI4x")
+_ENTRADA = struct.Struct("<IIiIQ")
+
+# Os vetores de dados são float64, então tudo fica alinhado em 8 bytes
+_TAMANHO_VALOR = 8
+
+
+def gravar_tabelas(caminho, configuracoes, incluir_acumuladas=False):
+    """
+    Calcula as probabilidades de várias configurações e grava em um arquivo.
+
+    Args:
+        caminho: Caminho do arquivo a ser criado (sobrescrito se existir)
+        configuracoes: Iterável de pares (num_dados, lados)
+        incluir_acumuladas: Se True, grava também a distribuição acumulada
+
+    Returns:
+        Quantidade de tabelas gravadas
+
+    Raises:
+        ValueError: Se alguma configuração for inválida
+    """
+    # Remove duplicatas mantendo a ordem original
+    configuracoes = list(dict.fromkeys(tuple(c) for c in configuracoes))
+
+    # Os dados começam logo após o cabeçalho e o índice
+    deslocamento = _CABECALHO.size + _ENTRADA.size * len(configuracoes)
+
+    indice = []
+    valores = array("d")
+    for num_dados, lados in configuracoes:
+        contagens = contar_combinacoes(num_dados, lados)
+        probabilidades = em_percentuais(contagens)
+
+        # As somas possíveis são contíguas (de num_dados até num_dados * lados)
+        soma_minima = min(probabilidades)
+        quantidade = len(probabilidades)
+
+        indice.append(_ENTRADA.pack(num_dados, lados, soma_minima, quantidade, deslocamento))
+        valores.extend(probabilidades.values())
+        deslocamento += quantidade * _TAMANHO_VALOR
+
+        if incluir_acumuladas:
+            valores.extend(em_percentuais_acumulados(contagens))
+            deslocamento += quantidade * _TAMANHO_VALOR
+
+    # O arquivo é sempre little-endian, independente da plataforma
+    if sys.byteorder != "little":
+        valores.byteswap()
+
+    flags = FLAG_ACUMULADAS if incluir_acumuladas else 0
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(ASSINATURA, VERSAO, flags, len(configuracoes)))
+        arquivo.write(b"".join(indice))
+        arquivo.write(valores.tobytes())
+
+    return len(configuracoes)
+
+
+class TabelasProbabilidades:
+    """
+    Leitor de um arquivo de tabelas gravado por gravar_tabelas().
+
+    O arquivo é mapeado em memória (somente leitura). As consultas devolvem
+    memoryviews sobre o próprio mapeamento, sem copiar os dados.
+
+    Exemplo:
+        with TabelasProbabilidades("tabelas.bin") as tabelas:
+            prob = tabelas.obter(2, 6)     # memoryview de float64
+            prob[7 - tabelas.soma_minima(2, 6)]  # 16.67
+    """
+
+    def __init__(self, caminho):
+        """
+        Abre o arquivo e carrega o índice.
+
+        Args:
+            caminho: Caminho do arquivo de tabelas
+
+        Raises:
+            ValueError: Se o arquivo não estiver no formato esperado
+        """
+        with open(caminho, "rb") as arquivo:
+            self._mmap = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Em plataformas big-endian os valores precisam ser invertidos,
+        # então não há acesso sem cópia
+        self._inverter = sys.byteorder != "little"
+        self._valores = None
+
+        try:
+            self._indice = self._ler_indice()
+            if not self._inverter:
+                # Visão float64 de todo o arquivo
+                self._valores = memoryview(self._mmap).cast("d")
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    def _ler_indice(self):
+        """
+        Lê o cabeçalho e monta o dicionário de consulta.
+
+        Returns:
+            Dicionário (num_dados, lados) → (soma_minima, inicio, quantidade),
+            onde inicio é a posição do primeiro valor em unidades de float64
+        """
+        if len(self._mmap) < _CABECALHO.size:
+            raise ValueError("Arquivo de tabelas truncado")
+        # O arquivo inteiro é lido como float64
+        if len(self._mmap) % _TAMANHO_VALOR:
+            raise ValueError("Arquivo de tabelas com tamanho inválido")
+
+        assinatura, versao, flags, num_entradas = _CABECALHO.unpack_from(self._mmap, 0)
+        if assinatura != ASSINATURA:
+            raise ValueError("Arquivo não é uma tabela de probabilidades")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de tabela não suportada: {versao}")
+
+        self.tem_acumuladas = bool(flags & FLAG_ACUMULADAS)
+        # Quantos vetores (probabilidades e, se houver, acumuladas) por entrada
+        vetores = 2 if self.tem_acumuladas else 1
+
+        if len(self._mmap) < _CABECALHO.size + _ENTRADA.size * num_entradas:
+            raise ValueError("Arquivo de tabelas truncado")
+
+        indice = {}
+        for i in range(num_entradas):
+            num_dados, lados, soma_minima, quantidade, deslocamento = _ENTRADA.unpack_from(
+                self._mmap, _CABECALHO.size + _ENTRADA.size * i
+            )
+            if deslocamento % _TAMANHO_VALOR:
+                raise ValueError("Arquivo de tabelas com deslocamento inválido")
+            if deslocamento + vetores * quantidade * _TAMANHO_VALOR > len(self._mmap):
+                raise ValueError("Arquivo de tabelas truncado")
+            indice[(num_dados, lados)] = (
+                soma_minima,
+                deslocamento // _TAMANHO_VALOR,
+                quantidade,
+            )
+        return indice
+
+    def obter(self, num_dados, lados):
+        """
+        Retorna as probabilidades de uma configuração sem copiar os dados.
+
+        Args:
+            num_dados: Quantidade de dados
+            lados: Número de lados de cada dado
+
+        Returns:
+            Sequência de float64 (memoryview) com as probabilidades em %.
+            A posição i corresponde à soma soma_minima(num_dados, lados) + i.
+
+        Raises:
+            KeyError: Se a configuração não estiver no arquivo
+        """
+        _, inicio, quantidade = self._indice[(num_dados, lados)]
+        return self._vetor(inicio, quantidade)
+
+    def acumuladas(self, num_dados, lados):
+        """
+        Retorna a distribuição acumulada (%) de uma configuração, sem cópia.
+
+        A posição i é a probabilidade de a soma ser ≤ soma_minima + i.
+
+        Raises:
+            KeyError: Se a configuração não estiver no arquivo
+            ValueError: Se o arquivo foi gravado sem as acumuladas
+        """
+        if not self.tem_acumuladas:
+            raise ValueError("Arquivo gravado sem as distribuições acumuladas")
+        _, inicio, quantidade = self._indice[(num_dados, lados)]
+        return self._vetor(inicio + quantidade, quantidade)
+
+    def _vetor(self, inicio, quantidade):
+        """Retorna `quantidade` valores float64 a partir da posição `inicio`."""
+        if self._mmap.closed:
+            raise ValueError("Arquivo de tabelas já foi fechado")
+
+        if self._inverter:
+            # Fallback para big-endian: copia e inverte os bytes
+            valores = array("d")
+            valores.frombytes(self._mmap[inicio * _TAMANHO_VALOR:(inicio + quantidade) * _TAMANHO_VALOR])
+            valores.byteswap()
+            return memoryview(valores)
+
+        return self._valores[inicio:inicio + quantidade]
+
+    def soma_minima(self, num_dados, lados):
+        """
+        Retorna a menor soma possível de uma configuração armazenada.
+
+        Raises:
+            KeyError: Se a configuração não estiver no arquivo
+        """
+        return self._indice[(num_dados, lados)][0]
+
+    def como_dicionario(self, num_dados, lados):
+        """
+        Retorna a tabela no mesmo formato de calcular_probabilidades().
+
+        Raises:
+            KeyError: Se a configuração não estiver no arquivo
+        """
+        soma_minima = self.soma_minima(num_dados, lados)
+        return {
+            soma_minima + i: prob
+            for i, prob in enumerate(self.obter(num_dados, lados))
+        }
+
+    def configuracoes(self):
+        """Retorna a lista de pares (num_dados, lados) armazenados."""
+        return list(self._indice)
+
+    def __contains__(self, configuracao):
+        return tuple(configuracao) in self._indice
+
+    def __len__(self):
+        return len(self._indice)
+
+    def fechar(self):
+        """
+        Libera o mapeamento de memória.
+
+        As memoryviews devolvidas por obter() devem ser liberadas antes;
+        caso contrário o sistema impede o fechamento (BufferError) e o
+        leitor continua aberto e utilizável.
+        """
+        if self._valores is not None:
+            self._valores.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Ainda há memoryviews em uso: recria a visão liberada acima
+            if not self._inverter:
+                self._valores = memoryview(self._mmap).cast("d")
+            raise
+        self._valores = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,263 @@
+"""
+Módulo de validação estatística das simulações.
+
+Compara o histograma de uma simulação com a distribuição exata de
+calcular_probabilidades() usando os testes qui-quadrado, G (razão de
+verossimilhança) e Kolmogorov-Smirnov. Tudo em Python puro, sem SciPy.
+
+Também pode ser executado pela linha de comando, para a validação pesada
+antes de um lançamento:
+    python dice_validacao.py --jogadas 100000000 --backend mersenne
+"""
+
+import argparse
+import math
+from collections import namedtuple
+
+from dice_logic import calcular_probabilidades, simular_jogadas_paralelo
+from dice_rng import BACKENDS
+
+# Resultado de um teste de aderência
+ResultadoTeste = namedtuple("ResultadoTeste", ["estatistica", "graus_liberdade", "p_valor"])
+
+# Frequência esperada mínima de cada classe nos testes qui-quadrado e G
+ESPERADO_MINIMO = 5.0
+
+
+def _gama_superior_regularizada(a, x):
+    """
+    Calcula Q(a, x), a função gama incompleta superior regularizada.
+
+    Usa a série de potências para x < a + 1 e a fração contínua de
+    Lentz nos demais casos (ambas convergem rápido em suas regiões).
+    """
+    if x <= 0:
+        return 1.0
+
+    log_prefixo = a * math.log(x) - x - math.lgamma(a)
+
+    if x < a + 1:
+        # Série para P(a, x); Q = 1 - P
+        termo = soma = 1.0 / a
+        denominador = a
+        for _ in range(10000):
+            denominador += 1
+            termo *= x / denominador
+            soma += termo
+            if abs(termo) < abs(soma) * 1e-15:
+                break
+        return max(0.0, 1.0 - soma * math.exp(log_prefixo))
+
+    # Fração contínua para Q(a, x)
+    minusculo = 1e-300
+    b = x + 1 - a
+    c = 1 / minusculo
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        if abs(d) < minusculo:
+            d = minusculo
+        c = b + an / c
+        if abs(c) < minusculo:
+            c = minusculo
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefixo) * h
+
+
+def p_valor_qui_quadrado(estatistica, graus_liberdade):
+    """
+    Retorna P(X ≥ estatistica) para X com distribuição qui-quadrado.
+
+    Args:
+        estatistica: Valor observado da estatística
+        graus_liberdade: Graus de liberdade (inteiro > 0)
+    """
+    return _gama_superior_regularizada(graus_liberdade / 2, estatistica / 2)
+
+
+def _classes_agrupadas(contagem, probabilidades):
+    """
+    Monta pares (observado, esperado) por soma, juntando classes pequenas.
+
+    Somas com frequência esperada abaixo de ESPERADO_MINIMO (as caudas)
+    são acumuladas com as vizinhas até atingir o mínimo.
+
+    Returns:
+        Lista de pares (observado, esperado)
+    """
+    total = sum(contagem.values())
+    classes = []
+    observado = esperado = 0.0
+    for soma, prob in sorted(probabilidades.items()):
+        observado += contagem.get(soma, 0)
+        esperado += prob / 100 * total
+        if esperado >= ESPERADO_MINIMO:
+            classes.append((observado, esperado))
+            observado = esperado = 0.0
+
+    # Sobra da cauda direita vai para a última classe
+    if esperado > 0 or observado > 0:
+        if classes:
+            ultimo_obs, ultimo_esp = classes.pop()
+            classes.append((ultimo_obs + observado, ultimo_esp + esperado))
+        else:
+            classes.append((observado, esperado))
+    return classes
+
+
+def _validar_contagem(contagem, probabilidades):
+    """Garante que a simulação só tem somas possíveis e não está vazia."""
+    if not sum(contagem.values()):
+        raise ValueError("A contagem não tem nenhuma jogada")
+    impossiveis = set(contagem) - set(probabilidades)
+    if impossiveis:
+        raise ValueError(f"Somas impossíveis na simulação: {sorted(impossiveis)}")
+
+
+def teste_qui_quadrado(contagem, probabilidades):
+    """
+    Teste qui-quadrado de Pearson.
+
+    Args:
+        contagem: Counter retornado pela simulação
+        probabilidades: Dicionário de calcular_probabilidades() (em %)
+
+    Returns:
+        ResultadoTeste; p_valor pequeno indica que a simulação não segue
+        a distribuição teórica
+    """
+    _validar_contagem(contagem, probabilidades)
+    classes = _classes_agrupadas(contagem, probabilidades)
+
+    estatistica = sum((obs - esp) ** 2 / esp for obs, esp in classes)
+    graus = max(1, len(classes) - 1)
+    return ResultadoTeste(estatistica, graus, p_valor_qui_quadrado(estatistica, graus))
+
+
+def teste_g(contagem, probabilidades):
+    """
+    Teste G (razão de verossimilhança): G = 2 Σ O ln(O / E).
+
+    Args e Returns iguais aos de teste_qui_quadrado().
+    """
+    _validar_contagem(contagem, probabilidades)
+    classes = _classes_agrupadas(contagem, probabilidades)
+
+    # Classes sem observações contribuem com zero (limite de O ln O)
+    estatistica = 2 * sum(obs * math.log(obs / esp) for obs, esp in classes if obs > 0)
+    graus = max(1, len(classes) - 1)
+    return ResultadoTeste(estatistica, graus, p_valor_qui_quadrado(estatistica, graus))
+
+
+def teste_ks(contagem, probabilidades):
+    """
+    Teste de Kolmogorov-Smirnov entre a distribuição acumulada simulada
+    e a teórica.
+
+    Para distribuições discretas o p-valor assintótico é conservador
+    (tende a ser maior que o real), então um p-valor pequeno continua
+    sendo forte indício de viés.
+
+    Args e Returns iguais aos de teste_qui_quadrado() (graus_liberdade
+    é sempre None).
+    """
+    _validar_contagem(contagem, probabilidades)
+    total = sum(contagem.values())
+
+    # Maior distância entre as duas funções de distribuição acumulada
+    acumulada_obs = acumulada_teo = 0.0
+    distancia = 0.0
+    for soma, prob in sorted(probabilidades.items()):
+        acumulada_obs += contagem.get(soma, 0) / total
+        acumulada_teo += prob / 100
+        distancia = max(distancia, abs(acumulada_obs - acumulada_teo))
+
+    # Distribuição de Kolmogorov com a correção de Stephens para n finito
+    raiz_n = math.sqrt(total)
+    lam = (raiz_n + 0.12 + 0.11 / raiz_n) * distancia
+    if lam < 0.2:
+        return ResultadoTeste(distancia, None, 1.0)
+
+    p_valor = 0.0
+    for k in range(1, 101):
+        termo = 2 * (-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam)
+        p_valor += termo
+        if abs(termo) < 1e-12:
+            break
+    return ResultadoTeste(distancia, None, min(1.0, max(0.0, p_valor)))
+
+
+def validar_backend(backend, num_dados, lados, num_jogadas, semente=None, num_threads=None):
+    """
+    Simula com um backend (em paralelo) e aplica os três testes.
+
+    Args:
+        backend: Nome do backend de dice_rng
+        num_dados: Quantidade de dados por jogada
+        lados: Número de lados de cada dado
+        num_jogadas: Quantidade de jogadas
+        semente: Semente da simulação (None sorteia uma)
+        num_threads: Quantidade de threads da simulação
+
+    Returns:
+        Dicionário {"qui_quadrado": ..., "g": ..., "ks": ...} com ResultadoTeste
+    """
+    probabilidades = calcular_probabilidades(num_dados, lados)
+    contagem = simular_jogadas_paralelo(
+        num_dados, lados, num_jogadas,
+        semente=semente, num_threads=num_threads, backend=backend,
+    )
+    return {
+        "qui_quadrado": teste_qui_quadrado(contagem, probabilidades),
+        "g": teste_g(contagem, probabilidades),
+        "ks": teste_ks(contagem, probabilidades),
+    }
+
+
+def main(argumentos=None):
+    """
+    Executa a validação pela linha de comando.
+
+    Returns:
+        0 se todos os testes passaram, 1 caso contrário
+    """
+    parser = argparse.ArgumentParser(description="Validação estatística dos backends")
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS),
+                        help="Backend a validar (pode repetir; padrão: todos)")
+    parser.add_argument("--dados", type=int, default=3, help="Quantidade de dados")
+    parser.add_argument("--lados", type=int, default=6, help="Lados de cada dado")
+    parser.add_argument("--jogadas", type=float, default=1e7, help="Jogadas por backend")
+    parser.add_argument("--semente", type=int, default=2024, help="Semente da simulação")
+    parser.add_argument("--threads", type=int, default=None, help="Threads da simulação")
+    parser.add_argument("--alfa", type=float, default=1e-3, help="Nível de significância")
+    args = parser.parse_args(argumentos)
+
+    aprovado = True
+    for backend in args.backend or sorted(BACKENDS):
+        try:
+            resultados = validar_backend(
+                backend, args.dados, args.lados, int(args.jogadas),
+                semente=args.semente, num_threads=args.threads,
+            )
+        except ImportError as error:
+            print(f"{backend}: ignorado ({error})")
+            continue
+
+        for nome, resultado in resultados.items():
+            situacao = "ok" if resultado.p_valor >= args.alfa else "FALHOU"
+            aprovado = aprovado and situacao == "ok"
+            print(f"{backend:>9} {nome:>12}: estatística={resultado.estatistica:.6g} "
+                  f"p={resultado.p_valor:.4g} [{situacao}]")
+
+    return 0 if aprovado else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,9 @@ import pytest
 from collections import Counter
 from itertools import product
 import random
+import math
+import time
+import tracemalloc
 
 # ============================================
 # Importa as funções do módulo de lógica
@@ -27,7 +30,67 @@ project_root = str(Path(__file__).parent.parent)
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from dice_logic import calcular_probabilidades, simular_jogadas
+from dice_logic import (
+    calcular_probabilidades,
+    calcular_probabilidades_aproximadas,
+    calcular_probabilidades_convolucao,
+    simular_jogadas,
+    simular_jogadas_paralelo,
+    simular_jogadas_em_blocos,
+    agrupar_somas,
+    GERADOR_GLOBAL,
+)
+from dice_progresso import AcompanhamentoProgresso
+from dice_async import (
+    calcular_probabilidades_async,
+    iterar_simulacao_async,
+    simular_jogadas_async,
+)
+import asyncio
+import os
+from dice_validacao import (
+    p_valor_qui_quadrado,
+    teste_qui_quadrado,
+    teste_g,
+    teste_ks,
+    validar_backend,
+)
+from dice_store import gravar_tabelas, TabelasProbabilidades
+from dice_bundle import gerar_pacote, PacoteAquecimento
+from dice_admissao import (
+    avaliar_pedido,
+    estimar_custo,
+    Orcamento,
+    CUSTOS,
+    DADOS_MIN_APROXIMACAO,
+)
+from dice_comparacao import AgregadorExecucoes, executar_comparacao
+from dice_estatisticas import (
+    calcular_contagem_faces,
+    calcular_sucessos,
+    calcular_maximo,
+    calcular_minimo,
+    calcular_conjunta_soma_faces,
+    condicionar,
+    probabilidade_pelo_menos,
+    simular_contagem_faces,
+    simular_sucessos,
+    simular_maximo,
+    simular_minimo,
+)
+from dice_rng import (
+    criar_gerador,
+    iterar_fluxos,
+    gerador_da_thread,
+    GeradorBase,
+    GeradorXoshiro,
+    GeradorMersenne,
+    GeradorPCG64,
+    BACKENDS,
+    BACKEND_PADRAO,
+)
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 
 # ============================================
@@ -44,11 +107,20 @@ def probabilidades_2d6():
 
 
 @pytest.fixture
-def seed_aleatoria():
+def gerador_semeado():
     """
-    Fixture que define uma seed para testes reproduzíveis.
+    Fixture que retorna um gerador com semente fixa para testes reproduzíveis.
     Garante que os testes de simulação sejam consistentes.
     """
+    return criar_gerador(semente=42)
+
+
+@pytest.fixture
+def seed_aleatoria():
+    """
+    Fixture que define uma seed do módulo global random.
+    Só afeta simular_jogadas() com gerador=GERADOR_GLOBAL.
+    """
     random.seed(42)
     yield
     random.seed()  # Restaura aleatoriedade após o teste
@@ -161,25 +233,25 @@ class TestSimularJogadas:
     Verifica se a simulação produz resultados válidos e estatisticamente corretos.
     """
     
-    def test_simular_jogadas_quantidade_correta(self, seed_aleatoria):
+    def test_simular_jogadas_quantidade_correta(self, gerador_semeado):
         """
         Testa se o número de jogadas simuladas está correto.
         A soma de todas as frequências deve ser igual ao número de jogadas.
         """
         num_jogadas = 1000
-        resultados = simular_jogadas(2, 6, num_jogadas)
+        resultados = simular_jogadas(2, 6, num_jogadas, gerador=gerador_semeado)
         
         # A soma de todas as contagens deve ser igual ao número de jogadas
         total_jogadas = sum(resultados.values())
         assert total_jogadas == num_jogadas
     
-    def test_simular_jogadas_valores_validos(self, seed_aleatoria):
+    def test_simular_jogadas_valores_validos(self, gerador_semeado):
         """
         Testa se todos os resultados estão dentro do intervalo válido.
         """
         num_dados = 2
         lados = 6
-        resultados = simular_jogadas(num_dados, lados, 1000)
+        resultados = simular_jogadas(num_dados, lados, 1000, gerador=gerador_semeado)
         
         # Todos os valores devem estar entre o mínimo e máximo possível
         valor_minimo = num_dados * 1
@@ -189,13 +261,13 @@ class TestSimularJogadas:
             assert valor >= valor_minimo
             assert valor <= valor_maximo
     
-    def test_simular_jogadas_distribuicao_uniforme_1d6(self, seed_aleatoria):
+    def test_simular_jogadas_distribuicao_uniforme_1d6(self, gerador_semeado):
         """
         Testa se a distribuição de 1D6 é aproximadamente uniforme.
         Com muitas jogadas, cada valor deve aparecer ~16.67% das vezes.
         """
         num_jogadas = 60000  # Número alto para reduzir variação estatística
-        resultados = simular_jogadas(1, 6, num_jogadas)
+        resultados = simular_jogadas(1, 6, num_jogadas, gerador=gerador_semeado)
         
         # Cada valor deve aparecer aproximadamente 10.000 vezes (16.67%)
         for valor in range(1, 7):
@@ -235,6 +307,30 @@ class TestSimularJogadas:
         
         # O erro deve diminuir com mais jogadas
         assert erro_grande < erro_pequeno
+    
+    def test_simular_jogadas_sem_gerador_nao_usa_random_global(self):
+        """
+        Sem gerador explícito a simulação usa o gerador da thread atual,
+        sem alterar (nem depender de) o estado global do módulo random.
+        """
+        random.seed(42)
+        estado = random.getstate()
+        resultados = simular_jogadas(2, 6, 1000)
+        
+        assert sum(resultados.values()) == 1000
+        assert random.getstate() == estado
+    
+    def test_simular_jogadas_gerador_global(self, seed_aleatoria):
+        """
+        Com GERADOR_GLOBAL a simulação usa o módulo random e é reproduzível
+        com random.seed().
+        """
+        resultado_a = simular_jogadas(2, 6, 1000, gerador=GERADOR_GLOBAL)
+        random.seed(42)
+        resultado_b = simular_jogadas(2, 6, 1000, gerador=GERADOR_GLOBAL)
+        
+        assert resultado_a == resultado_b
+        assert sum(resultado_a.values()) == 1000
 
 
 # ============================================
@@ -343,11 +439,11 @@ class TestPerformance:
         """
         benchmark(calcular_probabilidades, 2, 6)
     
-    def test_simulacao_rapida_1000_jogadas(self, benchmark, seed_aleatoria):
+    def test_simulacao_rapida_1000_jogadas(self, benchmark, gerador_semeado):
         """
         Testa a velocidade da simulação de 1000 jogadas.
         """
-        benchmark(simular_jogadas, 2, 6, 1000)
+        benchmark(simular_jogadas, 2, 6, 1000, gerador=gerador_semeado)
 
 
 # ============================================
@@ -382,7 +478,7 @@ class TestIntegracao:
     Testes que verificam a integração entre componentes.
     """
     
-    def test_fluxo_completo_simulacao(self, seed_aleatoria):
+    def test_fluxo_completo_simulacao(self, gerador_semeado):
         """
         Testa o fluxo completo: calcular probabilidades → simular → comparar.
         Simula o uso real do aplicativo.
@@ -397,7 +493,7 @@ class TestIntegracao:
         assert len(prob_teoricas) > 0
         
         # 3. Simular jogadas
-        resultados = simular_jogadas(num_dados, lados, num_jogadas)
+        resultados = simular_jogadas(num_dados, lados, num_jogadas, gerador=gerador_semeado)
         assert sum(resultados.values()) == num_jogadas
         
         # 4. Comparar resultados (devem estar próximos)
@@ -409,6 +505,1160 @@ class TestIntegracao:
             assert pytest.approx(prob_observada, abs=3.0) == prob_teorica
 
 
+# ============================================
+# TESTES DOS GERADORES ALEATÓRIOS
+# ============================================
+
+class TestGeradores:
+    """
+    Testes para os backends de dice_rng usados por simular_jogadas().
+    """
+    
+    @pytest.mark.parametrize("backend", ["xoshiro", "mersenne"])
+    def test_mesma_semente_mesmo_resultado(self, backend):
+        """
+        A mesma semente e o mesmo fluxo devem reproduzir a simulação.
+        """
+        resultado_a = simular_jogadas(2, 6, 2000, gerador=criar_gerador(backend, 42))
+        resultado_b = simular_jogadas(2, 6, 2000, gerador=criar_gerador(backend, 42))
+        assert resultado_a == resultado_b
+        assert sum(resultado_a.values()) == 2000
+    
+    @pytest.mark.parametrize("backend", ["xoshiro", "mersenne"])
+    def test_fluxos_diferentes_sao_independentes(self, backend):
+        """
+        Fluxos diferentes com a mesma semente devem gerar sequências diferentes.
+        """
+        fluxo_0 = criar_gerador(backend, 42, fluxo=0).inteiros(1000, 50)
+        fluxo_1 = criar_gerador(backend, 42, fluxo=1).inteiros(1000, 50)
+        assert list(fluxo_0) != list(fluxo_1)
+    
+    @pytest.mark.parametrize("backend", ["xoshiro", "mersenne"])
+    def test_inteiros_dentro_do_limite(self, backend):
+        """
+        Os inteiros gerados devem ficar em [0, limite) e cobrir todo o intervalo.
+        """
+        gerador = criar_gerador(backend, 7)
+        for limite in (1, 2, 6, 7, 20, 100):
+            valores = list(gerador.inteiros(limite, 2000))
+            assert len(valores) == 2000
+            assert min(valores) == 0
+            assert max(valores) == limite - 1
+    
+    def test_xoshiro_vetor_de_referencia(self):
+        """
+        Confere a saída do xoshiro256** com o vetor da implementação de referência.
+        """
+        gerador = GeradorXoshiro(0)
+        gerador._s = [1, 2, 3, 4]
+        assert [gerador.proximo() for _ in range(4)] == [
+            11520, 0, 1509978240, 1215971899390074240,
+        ]
+    
+    def test_saltar_equivale_ao_fluxo(self):
+        """
+        Saltar manualmente deve levar ao mesmo estado do fluxo seguinte.
+        """
+        gerador = GeradorXoshiro(42)
+        gerador.saltar()
+        assert gerador.inteiros(100, 20) == GeradorXoshiro(42, fluxo=1).inteiros(100, 20)
+    
+    def test_pcg64_reproduzivel(self):
+        """
+        O backend do NumPy (opcional) também deve ser reproduzível.
+        """
+        pytest.importorskip("numpy")
+        resultado_a = simular_jogadas(3, 6, 5000, gerador=criar_gerador("pcg64", 1, fluxo=3))
+        resultado_b = simular_jogadas(3, 6, 5000, gerador=criar_gerador("pcg64", 1, fluxo=3))
+        assert resultado_a == resultado_b
+        assert min(resultado_a) >= 3 and max(resultado_a) <= 18
+
+    @pytest.mark.parametrize("backend", ["xoshiro", "mersenne"])
+    def test_iterar_fluxos_equivale_a_criar_gerador(self, backend):
+        """
+        O i-ésimo gerador do iterador deve ser o fluxo i da semente,
+        criado só quando for pedido.
+        """
+        fluxos = iterar_fluxos(backend, 42, 10**9)
+        for fluxo in range(3):
+            esperado = criar_gerador(backend, 42, fluxo).inteiros(1000, 20)
+            assert next(fluxos).inteiros(1000, 20) == esperado
+        
+        with pytest.raises(ValueError):
+            iterar_fluxos("inexistente", 42, 3)
+    
+    def test_fluxo_distante_do_xoshiro_igual_aos_saltos(self):
+        """
+        Fluxos grandes (calculados pelas potências da matriz de salto) devem
+        ter o mesmo estado que saltar() repetido, e ser criados rapidamente.
+        """
+        gerador = GeradorXoshiro(42)
+        for _ in range(300):
+            gerador.saltar()
+        assert GeradorXoshiro(42, 300).inteiros(1000, 20) == gerador.inteiros(1000, 20)
+        
+        # Com as potências já calculadas, um milhão de saltos é imediato
+        GeradorXoshiro(42, 10**6)
+        inicio = time.perf_counter()
+        GeradorXoshiro(7, 10**6 + 3)
+        assert time.perf_counter() - inicio < 0.1
+    
+    def test_backend_padrao_e_o_mais_rapido_disponivel(self):
+        """
+        Sem backend explícito usa o PCG64 com NumPy, senão o Mersenne Twister.
+        O xoshiro em Python puro só é usado quando pedido.
+        """
+        try:
+            import numpy  # noqa: F401
+            esperado = GeradorPCG64
+        except ImportError:
+            esperado = GeradorMersenne
+        assert BACKENDS[BACKEND_PADRAO] is esperado
+        assert isinstance(criar_gerador(semente=1), esperado)
+
+    def test_backend_invalido_deve_falhar(self):
+        """
+        Backends desconhecidos e sementes inválidas devem gerar ValueError.
+        """
+        with pytest.raises(ValueError):
+            criar_gerador("inexistente")
+        
+        with pytest.raises(ValueError):
+            criar_gerador("xoshiro", semente=-1)
+
+
+# ============================================
+# TESTES DE CONCORRÊNCIA
+# ============================================
+
+class TestConcorrencia:
+    """
+    Testes de uso concorrente do motor de simulação.
+    Garante que resultados com semente explícita não dependem das threads.
+    """
+    
+    @pytest.mark.parametrize("backend", ["xoshiro", "mersenne"])
+    def test_paralelo_independe_do_numero_de_threads(self, backend):
+        """
+        A mesma semente deve gerar o mesmo resultado com 1 ou várias threads.
+        """
+        num_jogadas = 150000  # Mais de duas partes de TAMANHO_BLOCO
+        sequencial = simular_jogadas_paralelo(2, 6, num_jogadas, semente=42,
+                                              num_threads=1, backend=backend)
+        paralelo = simular_jogadas_paralelo(2, 6, num_jogadas, semente=42,
+                                            num_threads=8, backend=backend)
+        
+        assert sequencial == paralelo
+        assert sum(paralelo.values()) == num_jogadas
+    
+    def test_estresse_chamadas_simultaneas(self):
+        """
+        Várias threads simulando ao mesmo tempo, cada uma com seu gerador,
+        devem obter exatamente o mesmo resultado da execução sequencial.
+        """
+        num_tarefas = 32
+        
+        def tarefa(fluxo):
+            gerador = criar_gerador("mersenne", semente=7, fluxo=fluxo)
+            return simular_jogadas(3, 6, 2000, gerador=gerador)
+        
+        esperado = [tarefa(fluxo) for fluxo in range(num_tarefas)]
+        
+        # Barreira para que as threads comecem juntas e disputem a CPU
+        barreira = threading.Barrier(8)
+        
+        def tarefa_sincronizada(fluxo):
+            if fluxo < 8:
+                barreira.wait()
+            return tarefa(fluxo)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            obtido = list(executor.map(tarefa_sincronizada, range(num_tarefas)))
+        
+        assert obtido == esperado
+    
+    def test_gerador_da_thread_exclusivo(self):
+        """
+        Cada thread deve receber o seu próprio gerador.
+        """
+        geradores = []
+        # Mantém as threads vivas até todas registrarem seus geradores
+        barreira = threading.Barrier(4)
+        
+        def registrar():
+            gerador = gerador_da_thread()
+            assert gerador_da_thread() is gerador
+            geradores.append(gerador)
+            barreira.wait()
+        
+        threads = [threading.Thread(target=registrar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len({id(gerador) for gerador in geradores}) == 4
+
+
+# ============================================
+# TESTES DE SIMULAÇÃO EM BLOCOS E PROGRESSO
+# ============================================
+
+class TestSimulacaoEmBlocos:
+    """
+    Testes para simular_jogadas_em_blocos() e AcompanhamentoProgresso.
+    """
+    
+    def test_blocos_equivalem_a_simulacao_completa(self):
+        """
+        O último histograma parcial deve ser igual à simulação de uma vez só.
+        """
+        blocos = list(simular_jogadas_em_blocos(
+            2, 6, 10500, gerador=criar_gerador("mersenne", 3), tamanho_bloco=1000
+        ))
+        
+        # 10 blocos completos e um bloco final de 500 jogadas
+        assert [feitas for _, feitas in blocos] == list(range(1000, 10001, 1000)) + [10500]
+        
+        contagem_final = blocos[-1][0]
+        assert sum(contagem_final.values()) == 10500
+        assert contagem_final == simular_jogadas(
+            2, 6, 10500, gerador=criar_gerador("mersenne", 3)
+        )
+    
+    def test_tamanho_bloco_invalido_deve_falhar(self):
+        """
+        Blocos de tamanho zero devem gerar ValueError.
+        """
+        with pytest.raises(ValueError):
+            list(simular_jogadas_em_blocos(2, 6, 100, tamanho_bloco=0))
+    
+    def test_progresso_limita_atualizacoes(self):
+        """
+        Com intervalo de 0,1s, só deve atualizar a cada 0,1s (além do início e fim).
+        """
+        agora = [0.0]
+        progresso = AcompanhamentoProgresso(1000, relogio=lambda: agora[0])
+        
+        atualizacoes = []
+        for passo in range(1, 101):
+            agora[0] = passo * 0.01  # 10ms por bloco de 10 jogadas
+            atualizacoes.append(progresso.registrar(passo * 10))
+        
+        # Primeira chamada, ~1 a cada 10 blocos e a última
+        assert atualizacoes[0] is True
+        assert atualizacoes[-1] is True
+        assert 9 <= sum(atualizacoes) <= 12
+    
+    def test_progresso_velocidade_e_tempo_restante(self):
+        """
+        Verifica o cálculo de jogadas por segundo e do tempo restante.
+        """
+        agora = [0.0]
+        progresso = AcompanhamentoProgresso(1000, relogio=lambda: agora[0])
+        assert progresso.segundos_restantes is None
+        
+        agora[0] = 2.0
+        progresso.registrar(250)
+        assert progresso.jogadas_por_segundo == 125.0
+        assert progresso.segundos_restantes == 6.0
+        assert progresso.texto() == "25% · 125 jogadas/s · restam 6s"
+
+
+# ============================================
+# TESTES DA API ASSÍNCRONA
+# ============================================
+
+class ExecutorContador(ThreadPoolExecutor):
+    """Executor que conta quantas tarefas recebeu (para testar o agrupamento)."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.envios = 0
+    
+    def submit(self, *args, **kwargs):
+        self.envios += 1
+        return super().submit(*args, **kwargs)
+
+
+class TestApiAssincrona:
+    """
+    Testes para as funções de dice_async.
+    """
+    
+    def test_calcular_probabilidades_async(self):
+        """
+        O resultado assíncrono deve ser igual ao cálculo síncrono.
+        """
+        prob = asyncio.run(calcular_probabilidades_async(3, 6))
+        assert prob == calcular_probabilidades(3, 6)
+    
+    def test_pedidos_simultaneos_sao_agrupados(self):
+        """
+        Vários pedidos feitos juntos devem usar uma única chamada ao executor.
+        """
+        configuracoes = [(1, 6), (2, 6), (3, 6), (1, 20), (2, 6)] * 4
+        
+        async def principal(executor):
+            return await asyncio.gather(*(
+                calcular_probabilidades_async(num_dados, lados, executor=executor)
+                for num_dados, lados in configuracoes
+            ))
+        
+        with ExecutorContador(max_workers=2) as executor:
+            resultados = asyncio.run(principal(executor))
+            assert executor.envios == 1
+        
+        for (num_dados, lados), prob in zip(configuracoes, resultados):
+            assert prob == calcular_probabilidades(num_dados, lados)
+    
+    def test_erro_de_validacao_no_lote(self):
+        """
+        Um pedido inválido deve falhar sem afetar os outros pedidos do lote.
+        """
+        async def principal():
+            return await asyncio.gather(
+                calcular_probabilidades_async(2, 6),
+                calcular_probabilidades_async(0, 6),
+                return_exceptions=True,
+            )
+        
+        valido, invalido = asyncio.run(principal())
+        assert valido == calcular_probabilidades(2, 6)
+        assert isinstance(invalido, ValueError)
+    
+    def test_simular_jogadas_async_reproduzivel(self):
+        """
+        Com o mesmo gerador, o resultado deve ser igual ao da versão síncrona.
+        """
+        resultado = asyncio.run(simular_jogadas_async(
+            2, 6, 5000, gerador=criar_gerador("mersenne", 9), tamanho_bloco=700
+        ))
+        assert resultado == simular_jogadas(2, 6, 5000, gerador=criar_gerador("mersenne", 9))
+    
+    def test_iterador_entrega_resultados_parciais(self):
+        """
+        O iterador assíncrono deve entregar um histograma a cada bloco.
+        """
+        async def principal():
+            return [
+                (sum(contagem.values()), feitas)
+                async for contagem, feitas in iterar_simulacao_async(
+                    1, 6, 2500, tamanho_bloco=1000
+                )
+            ]
+        
+        assert asyncio.run(principal()) == [(1000, 1000), (2000, 2000), (2500, 2500)]
+    
+    def test_cancelamento_entre_blocos(self):
+        """
+        Cancelar a tarefa deve interromper a simulação entre os blocos.
+        """
+        blocos_feitos = []
+        
+        async def consumir():
+            async for _, feitas in iterar_simulacao_async(2, 6, 10**9, tamanho_bloco=100):
+                blocos_feitos.append(feitas)
+        
+        async def principal():
+            tarefa = asyncio.create_task(consumir())
+            while not blocos_feitos:
+                await asyncio.sleep(0.001)
+            tarefa.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await tarefa
+        
+        asyncio.run(principal())
+        assert 0 < len(blocos_feitos) < 10**7
+
+    def test_gerador_livre_apos_cancelamento(self):
+        """
+        Depois de aguardar a tarefa cancelada, nenhum bloco pode continuar
+        usando o gerador na thread do executor.
+        """
+        class GeradorBloqueante(GeradorBase):
+            """Gerador cujo bloco só termina quando for liberado."""
+            def __init__(self):
+                self.iniciou = threading.Event()
+                self.liberar = threading.Event()
+                self.blocos_ativos = 0
+
+            def contar_somas(self, num_dados, lados, quantidade):
+                self.blocos_ativos += 1
+                self.iniciou.set()
+                self.liberar.wait(5)
+                self.blocos_ativos -= 1
+                return Counter({num_dados: quantidade})
+
+        gerador = GeradorBloqueante()
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def consumir():
+            async for _ in iterar_simulacao_async(1, 6, 10**6, gerador=gerador,
+                                                  executor=executor):
+                pass
+
+        async def principal():
+            tarefa = asyncio.create_task(consumir())
+            while not gerador.iniciou.is_set():
+                await asyncio.sleep(0.001)
+            tarefa.cancel()
+            # O bloco em andamento só termina depois do cancelamento
+            asyncio.get_running_loop().call_later(0.05, gerador.liberar.set)
+            with pytest.raises(asyncio.CancelledError):
+                await tarefa
+            return gerador.blocos_ativos
+
+        with executor:
+            assert asyncio.run(principal()) == 0
+
+
+# ============================================
+# TESTES DE VALIDAÇÃO ESTATÍSTICA
+# ============================================
+
+# Nível de significância: com sementes fixas os p-valores são determinísticos,
+# então um valor abaixo disso indica viés real no gerador ou na amostragem
+ALFA = 1e-3
+
+# A camada pesada só roda quando pedida explicitamente (ex: antes de um lançamento)
+# Execute com: DICE_LAB_VALIDACAO_PESADA=1 pytest -m lento
+validacao_pesada = pytest.mark.skipif(
+    not os.environ.get("DICE_LAB_VALIDACAO_PESADA"),
+    reason="defina DICE_LAB_VALIDACAO_PESADA=1 para a validação pesada",
+)
+
+
+class GeradorComVies(GeradorBase):
+    """Gerador propositalmente viciado (usa módulo sobre poucos bits)."""
+    
+    def __init__(self):
+        self._random = random.Random(1)
+    
+    def inteiros(self, limite, quantidade):
+        # 3 bits (0-7) módulo 6: as faces 0 e 1 saem com o dobro da chance
+        return [self._random.getrandbits(3) % limite for _ in range(quantidade)]
+
+
+class TestValidacaoEstatistica:
+    """
+    Testes de aderência das simulações à distribuição exata.
+    Camada rápida: roda em todo commit com algumas centenas de milhares de jogadas.
+    """
+    
+    def test_p_valor_qui_quadrado_valores_conhecidos(self):
+        """
+        Confere a função de sobrevivência com valores críticos de tabela.
+        """
+        assert pytest.approx(p_valor_qui_quadrado(3.841, 1), abs=1e-4) == 0.05
+        assert pytest.approx(p_valor_qui_quadrado(18.307, 10), abs=1e-4) == 0.05
+        assert pytest.approx(p_valor_qui_quadrado(0.5, 4), rel=1e-9) == \
+            math.exp(-0.25) * 1.25
+    
+    @pytest.mark.rapido
+    @pytest.mark.parametrize("backend,num_jogadas", [
+        ("mersenne", 300000),
+        ("xoshiro", 60000),
+        ("pcg64", 300000),
+    ])
+    def test_backends_seguem_distribuicao_exata(self, backend, num_jogadas):
+        """
+        Cada backend deve passar nos três testes para 3D6.
+        """
+        if backend == "pcg64":
+            pytest.importorskip("numpy")
+        
+        resultados = validar_backend(backend, 3, 6, num_jogadas, semente=2024)
+        for nome, resultado in resultados.items():
+            assert resultado.p_valor >= ALFA, f"{backend}/{nome}: {resultado}"
+    
+    def test_vies_e_detectado(self):
+        """
+        O conjunto de testes deve rejeitar um gerador com viés de módulo.
+        """
+        probabilidades = calcular_probabilidades(2, 6)
+        contagem = simular_jogadas(2, 6, 20000, gerador=GeradorComVies())
+        
+        assert teste_qui_quadrado(contagem, probabilidades).p_valor < ALFA
+        assert teste_g(contagem, probabilidades).p_valor < ALFA
+        assert teste_ks(contagem, probabilidades).p_valor < ALFA
+    
+    def test_somas_impossiveis_devem_falhar(self):
+        """
+        Somas fora do intervalo possível devem gerar ValueError.
+        """
+        with pytest.raises(ValueError):
+            teste_qui_quadrado(Counter({13: 1}), calcular_probabilidades(2, 6))
+
+
+@pytest.mark.lento
+@validacao_pesada
+class TestValidacaoPesada:
+    """
+    Camada pesada: dezenas de milhões de jogadas por backend, usando a
+    simulação paralela. Pensada para rodar antes de cada lançamento.
+    """
+    
+    @pytest.mark.parametrize("backend,num_jogadas", [
+        ("mersenne", 10**7),
+        ("xoshiro", 10**7),
+        ("pcg64", 10**8),
+    ])
+    @pytest.mark.parametrize("num_dados,lados", [(1, 6), (3, 6), (2, 20)])
+    def test_backends_em_larga_escala(self, backend, num_jogadas, num_dados, lados):
+        """
+        Repete a validação com muito mais jogadas e outras configurações.
+        """
+        if backend == "pcg64":
+            pytest.importorskip("numpy")
+        
+        resultados = validar_backend(backend, num_dados, lados, num_jogadas, semente=2024)
+        for nome, resultado in resultados.items():
+            assert resultado.p_valor >= ALFA, f"{backend}/{nome}: {resultado}"
+
+
+# ============================================
+# TESTES DE ESTATÍSTICAS DOS DADOS INDIVIDUAIS
+# ============================================
+
+def distribuicao_por_forca_bruta(num_dados, lados, estatistica):
+    """
+    Calcula a distribuição de uma estatística enumerando todas as jogadas.
+    Usada apenas como referência para conferir os cálculos exatos.
+    """
+    contagem = Counter(estatistica(jogada)
+                       for jogada in product(range(1, lados + 1), repeat=num_dados))
+    total = lados ** num_dados
+    return {valor: (count / total) * 100 for valor, count in sorted(contagem.items())}
+
+
+def comparar_distribuicoes(obtida, esperada):
+    """Compara duas distribuições em % com tolerância de ponto flutuante."""
+    assert set(obtida) == set(esperada)
+    for valor, prob in esperada.items():
+        assert pytest.approx(obtida[valor], rel=1e-9) == prob
+
+
+class TestEstatisticasIndividuais:
+    """
+    Testes para dice_estatisticas: contagem de faces, máximo, mínimo,
+    sucessos e distribuições conjuntas/condicionais.
+    """
+    
+    @pytest.mark.parametrize("num_dados,lados", [(1, 6), (3, 6), (4, 4), (2, 10)])
+    def test_maximo_e_minimo_exatos(self, num_dados, lados):
+        """
+        Máximo e mínimo devem bater com a enumeração de todas as jogadas.
+        """
+        comparar_distribuicoes(calcular_maximo(num_dados, lados),
+                               distribuicao_por_forca_bruta(num_dados, lados, max))
+        comparar_distribuicoes(calcular_minimo(num_dados, lados),
+                               distribuicao_por_forca_bruta(num_dados, lados, min))
+    
+    @pytest.mark.parametrize("faces", [6, {1, 6}, range(1, 7)])
+    def test_contagem_faces_exata(self, faces):
+        """
+        A contagem de faces deve bater com a enumeração de 4D6.
+        """
+        conjunto = {faces} if isinstance(faces, int) else set(faces)
+        esperada = distribuicao_por_forca_bruta(
+            4, 6, lambda jogada: sum(face in conjunto for face in jogada)
+        )
+        comparar_distribuicoes(calcular_contagem_faces(4, 6, faces), esperada)
+    
+    def test_pelo_menos_dois_seis(self):
+        """
+        P(pelo menos dois 6 em 4D6) = 1 - (5^4 + 4·5^3) / 6^4 = 171/1296.
+        """
+        prob = probabilidade_pelo_menos(calcular_contagem_faces(4, 6, 6), 2)
+        assert pytest.approx(prob, rel=1e-9) == 171 / 1296 * 100
+    
+    def test_sucessos_exatos(self):
+        """
+        Sucessos em 5D10 com alvo 8+ devem bater com a enumeração.
+        """
+        esperada = distribuicao_por_forca_bruta(
+            5, 10, lambda jogada: sum(face >= 8 for face in jogada)
+        )
+        comparar_distribuicoes(calcular_sucessos(5, 10, 8), esperada)
+    
+    def test_conjunta_e_condicional(self):
+        """
+        A conjunta deve ter a soma como marginal e a condicional deve bater
+        com a enumeração filtrada.
+        """
+        conjunta = calcular_conjunta_soma_faces(3, 6, 6)
+        
+        marginal = Counter()
+        for (soma, _), prob in conjunta.items():
+            marginal[soma] += prob
+        comparar_distribuicoes(dict(marginal), calcular_probabilidades(3, 6))
+        
+        # Soma de 3D6 sabendo que saiu pelo menos um 6
+        jogadas = [j for j in product(range(1, 7), repeat=3) if 6 in j]
+        contagem = Counter(sum(j) for j in jogadas)
+        esperada = {soma: count / len(jogadas) * 100 for soma, count in contagem.items()}
+        comparar_distribuicoes(condicionar(conjunta, lambda acertos: acertos >= 1), esperada)
+    
+    @pytest.mark.parametrize("num_dados,lados,faces", [
+        (4, 6, {1, 3, 4}), (3, 8, range(1, 9)), (5, 5, 1), (3, 10, {2, 3, 4, 8, 10}),
+    ])
+    def test_conjunta_igual_a_forca_bruta(self, num_dados, lados, faces):
+        """
+        A convolução por faixas de faces deve bater com a enumeração,
+        inclusive com faces não contíguas e com todas as faces marcadas.
+        """
+        conjunto = {faces} if isinstance(faces, int) else set(faces)
+        esperada = distribuicao_por_forca_bruta(
+            num_dados, lados,
+            lambda jogada: (sum(jogada), sum(face in conjunto for face in jogada)),
+        )
+        comparar_distribuicoes(calcular_conjunta_soma_faces(num_dados, lados, faces), esperada)
+    
+    def test_conjunta_grande_sem_explosao(self):
+        """
+        O custo não deve crescer com lados² por estado (20D50 levava segundos).
+        """
+        inicio = time.perf_counter()
+        conjunta = calcular_conjunta_soma_faces(20, 50, {49, 50})
+        assert time.perf_counter() - inicio < 2
+        assert pytest.approx(sum(conjunta.values()), rel=1e-9) == 100
+    
+    @pytest.mark.parametrize("simulacao", [
+        lambda g: simular_maximo(4, 6, 3000, gerador=g),
+        lambda g: simular_minimo(3, 20, 3000, gerador=g),
+        lambda g: simular_contagem_faces(5, 6, {1, 6}, 3000, gerador=g),
+        lambda g: simular_sucessos(6, 10, 7, 3000, gerador=g),
+    ])
+    def test_simulacoes_vetorizadas_no_formato_do_python_puro(self, simulacao):
+        """
+        O caminho vetorizado (NumPy) deve devolver int comuns e o mesmo
+        formato do caminho em Python puro.
+        """
+        pytest.importorskip("numpy")
+        vetorizada = simulacao(criar_gerador("pcg64", 3))
+        pura = simulacao(criar_gerador("mersenne", 3))
+        assert sum(vetorizada.values()) == sum(pura.values()) == 3000
+        assert all(type(valor) is int for valor in vetorizada)
+        assert set(vetorizada) <= set(range(0, 21))
+    
+    def test_parametros_invalidos_devem_falhar(self):
+        """
+        Faces e alvos fora do dado devem gerar ValueError.
+        """
+        with pytest.raises(ValueError):
+            calcular_contagem_faces(2, 6, 7)
+        with pytest.raises(ValueError):
+            calcular_sucessos(2, 6, 0)
+        with pytest.raises(ValueError):
+            simular_maximo(0, 6, 100)
+        with pytest.raises(ValueError):
+            condicionar(calcular_conjunta_soma_faces(2, 6, 6), lambda acertos: acertos > 2)
+    
+    @pytest.mark.parametrize("simulacao,exata", [
+        (lambda g: simular_maximo(4, 6, 40000, gerador=g), lambda: calcular_maximo(4, 6)),
+        (lambda g: simular_minimo(4, 6, 40000, gerador=g), lambda: calcular_minimo(4, 6)),
+        (lambda g: simular_contagem_faces(5, 6, {5, 6}, 40000, gerador=g),
+         lambda: calcular_contagem_faces(5, 6, {5, 6})),
+        (lambda g: simular_sucessos(6, 10, 7, 40000, gerador=g),
+         lambda: calcular_sucessos(6, 10, 7)),
+    ])
+    def test_simulacoes_seguem_calculo_exato(self, simulacao, exata):
+        """
+        Cada simulação deve passar no qui-quadrado contra o cálculo exato.
+        """
+        contagem = simulacao(criar_gerador("mersenne", 11))
+        assert sum(contagem.values()) == 40000
+        assert teste_qui_quadrado(contagem, exata()).p_valor >= ALFA
+
+
+# ============================================
+# TESTES DE CONTROLE DE ADMISSÃO
+# ============================================
+
+class TestControleAdmissao:
+    """
+    Testes para o modelo de custo e a decisão de admissão de pedidos.
+    """
+    
+    def test_pedido_pequeno_aceito(self):
+        """
+        2D6 com 1000 jogadas deve rodar sem mudanças.
+        """
+        decisao = avaliar_pedido(2, 6, 1000)
+        assert decisao.acao == "aceitar"
+        assert decisao.motor_exato == "enumeracao"
+        assert decisao.motor_simulacao == "simulacao"
+        assert decisao.mensagem == ""
+    
+    def test_limites_antigos_nao_se_aplicam_a_casos_baratos(self):
+        """
+        Casos baratos acima dos antigos limites fixos (10 dados, 100 lados,
+        100.000 jogadas) devem ser aceitos.
+        """
+        assert avaliar_pedido(1, 1000, 1000).acao == "aceitar"
+        assert avaliar_pedido(1, 6, 1000000).acao in ("aceitar", "reduzir")
+    
+    def test_enumeracao_cara_usa_convolucao(self):
+        """
+        Configurações grandes demais para enumerar devem usar a convolução,
+        que é exata e não precisa de aviso.
+        """
+        decisao = avaliar_pedido(20, 6, 1000)
+        assert decisao.acao == "aceitar"
+        assert decisao.motor_exato == "convolucao"
+    
+    def test_aproximacao_apenas_com_muitos_dados(self):
+        """
+        A aproximação normal só deve substituir o exato a partir de
+        DADOS_MIN_APROXIMACAO dados; abaixo disso o pedido é recusado.
+        """
+        decisao = avaliar_pedido(DADOS_MIN_APROXIMACAO, 10**5, 1000)
+        assert decisao.acao == "reduzir"
+        assert decisao.motor_exato == "aproximacao"
+        assert "aproximadas" in decisao.mensagem
+        
+        decisao = avaliar_pedido(DADOS_MIN_APROXIMACAO - 1, 10**5, 1000)
+        assert decisao.acao == "rejeitar"
+        assert decisao.motor_exato == "convolucao"
+    
+    @pytest.mark.parametrize("num_dados,lados,orcamento", [
+        # 1 dado: enumerar passa do limite de memória de 64 MB
+        (1, 400000, Orcamento(segundos_max=60.0, memoria_max=64 * 1024 ** 2,
+                              segundos_interativo=0.5)),
+        (1, 5_000_000, None),
+        # 2 dados: 9 milhões de combinações, acima dos 512 MB padrão
+        (2, 3000, None),
+    ])
+    def test_motor_escolhido_igual_ao_exato(self, num_dados, lados, orcamento):
+        """
+        Com 1 e 2 dados o motor escolhido nunca pode trocar a distribuição
+        uniforme ou triangular pela curva normal.
+        """
+        argumentos = {"orcamento": orcamento} if orcamento else {}
+        decisao = avaliar_pedido(num_dados, lados, 1000, **argumentos)
+        assert decisao.motor_exato != "aproximacao"
+        if decisao.acao == "rejeitar":
+            return
+        
+        assert decisao.motor_exato == "convolucao"
+        probabilidades = calcular_probabilidades_convolucao(num_dados, lados)
+        total = lados ** num_dados
+        for soma, prob in probabilidades.items():
+            # 1 dado: 1 combinação por soma; 2 dados: min(s - 1, 2L + 1 - s)
+            combinacoes = 1 if num_dados == 1 else min(soma - 1, 2 * lados + 1 - soma)
+            assert pytest.approx(prob, rel=1e-12) == combinacoes / total * 100
+        assert len(probabilidades) == num_dados * (lados - 1) + 1
+    
+    @pytest.mark.parametrize("num_dados,lados", [(1, 1), (1, 6), (3, 1), (2, 6), (4, 7), (6, 6)])
+    def test_convolucao_igual_a_enumeracao(self, num_dados, lados):
+        """
+        A convolução deve dar exatamente o mesmo resultado da enumeração.
+        """
+        assert calcular_probabilidades_convolucao(num_dados, lados) == \
+            calcular_probabilidades(num_dados, lados)
+    
+    def test_tabela_pronta_nao_custa_nada(self):
+        """
+        Com a tabela exata já disponível não há custo de cálculo.
+        """
+        decisao = avaliar_pedido(20, 6, 1000, exato_disponivel=True)
+        assert decisao.motor_exato == "tabela"
+        assert decisao.acao == "aceitar"
+    
+    def test_simulacao_longa_em_blocos(self):
+        """
+        Simulações acima do limite interativo devem rodar em blocos.
+        """
+        decisao = avaliar_pedido(2, 6, 10**7)
+        assert decisao.acao == "reduzir"
+        assert decisao.motor_simulacao == "simulacao_em_blocos"
+    
+    def test_pedido_acima_do_orcamento_rejeitado(self):
+        """
+        Pedidos que excedem o orçamento devem ser rejeitados com mensagem clara.
+        """
+        decisao = avaliar_pedido(2, 6, 10**12)
+        assert decisao.acao == "rejeitar"
+        assert "Reduza para no máximo" in decisao.mensagem
+        
+        orcamento = Orcamento(segundos_max=60.0, memoria_max=1024, segundos_interativo=0.5)
+        decisao = avaliar_pedido(2, 6, 1000, orcamento=orcamento)
+        assert decisao.acao == "rejeitar"
+        assert "Memória" in decisao.mensagem
+
+    @pytest.mark.parametrize("num_dados,lados,num_jogadas", [
+        (400, 6, 1000),
+        (300, 100, 100),
+        (2, 10**200, 10),
+        (10**400, 6, 1),
+        (2, 6, 10**400),
+    ])
+    def test_pedidos_gigantes_nao_estouram(self, num_dados, lados, num_jogadas):
+        """
+        Custos que não cabem em um float devem ser tratados como acima do
+        orçamento, com mensagens curtas, sem OverflowError.
+        """
+        decisao = avaliar_pedido(num_dados, lados, num_jogadas)
+        assert decisao.acao in ("reduzir", "rejeitar")
+        assert decisao.motor_exato in ("convolucao", "aproximacao") or decisao.acao == "rejeitar"
+        assert len(decisao.mensagem) < 200
+
+    def test_mensagem_de_aproximacao_limitada(self):
+        """
+        O custo do cálculo exato de um milhão de moedas (1.000.000D2) deve
+        aparecer resumido, não com dezenas de dígitos.
+        """
+        decisao = avaliar_pedido(10**6, 2, 1)
+        assert decisao.motor_exato == "aproximacao"
+        assert "mais de 1 ano" in decisao.mensagem
+        assert len(decisao.mensagem) < 300
+
+    def test_muitas_somas_sao_agrupadas_na_exibicao(self):
+        """
+        O gráfico e a tabela não devem passar do limite de somas exibidas,
+        e o custo da exibição entra na estimativa.
+        """
+        decisao = avaliar_pedido(40, 1000, 1000)  # 39.961 somas possíveis
+        assert decisao.agrupamento == 40
+        assert -(-39961 // decisao.agrupamento) <= 1000
+        assert "faixas de 40" in decisao.mensagem
+        assert decisao.estimativa.segundos >= 1000 * CUSTOS["exibicao_segundos"]
+        
+        assert avaliar_pedido(2, 6, 1000).agrupamento == 1
+    
+    def test_comparacao_conta_execucoes_e_matriz(self):
+        """
+        No modo de comparação o custo fixo de cada execução e a matriz de
+        contagens entram na estimativa, não só o total de jogadas.
+        """
+        simples = avaliar_pedido(2, 6, 10**6)
+        muitas = avaliar_pedido(2, 6, 1, num_execucoes=10**6)
+        
+        # Mesmas jogadas no total, mas um milhão de execuções
+        assert muitas.estimativa.segundos > 10 * simples.estimativa.segundos
+        assert muitas.estimativa.bytes_pico > 10**6 * 11 * 8
+        
+        decisao = avaliar_pedido(2, 1000, 10, num_execucoes=10**5)
+        assert decisao.acao == "rejeitar"
+        assert "execuções" in decisao.mensagem
+        
+        with pytest.raises(ValueError):
+            avaliar_pedido(2, 6, 10, num_execucoes=0)
+    
+    def test_agrupar_somas(self):
+        """
+        Somas consecutivas devem ser somadas em faixas, sem perder o total.
+        """
+        assert agrupar_somas({2: 1, 3: 2, 4: 3, 5: 4}, 2, 3) == {2: 6, 5: 4}
+        
+        prob = calcular_probabilidades(3, 6)
+        faixas = agrupar_somas(prob, 3, 4)
+        assert list(faixas) == [3, 7, 11, 15]
+        assert pytest.approx(sum(faixas.values())) == 100.0
+        assert agrupar_somas(prob, 3, 1) is prob
+    
+    @pytest.mark.parametrize("lados", [6, 1000, 10**6])
+    def test_memoria_da_simulacao_cobre_o_pico_medido(self, lados):
+        """
+        A estimativa de memória deve cobrir o pico real de um bloco, inclusive
+        com mais de 256 lados, quando cada face vira um objeto int.
+        """
+        gerador = criar_gerador("mersenne", 1)
+        tracemalloc.start()
+        try:
+            simular_jogadas(4, lados, 65536, gerador=gerador)
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        estimativa = estimar_custo("simulacao", 4, lados, 65536, "mersenne")
+        assert estimativa.bytes_pico >= pico
+        assert estimativa.bytes_pico < 4 * pico
+    
+    def test_estimativa_cresce_com_o_pedido(self):
+        """
+        O custo estimado deve crescer com o número de combinações e jogadas.
+        """
+        assert estimar_custo("enumeracao", 4, 6).segundos < estimar_custo("enumeracao", 5, 6).segundos
+        assert estimar_custo("enumeracao", 4, 6).bytes_pico < estimar_custo("enumeracao", 5, 6).bytes_pico
+        assert estimar_custo("simulacao", 2, 6, 1000).segundos < estimar_custo("simulacao", 2, 6, 2000).segundos
+        with pytest.raises(ValueError):
+            estimar_custo("inexistente", 2, 6)
+    
+    def test_aproximacao_proxima_do_exato(self):
+        """
+        A aproximação normal deve ficar próxima do cálculo exato e somar 100%.
+        """
+        exata = calcular_probabilidades(6, 6)
+        aproximada = calcular_probabilidades_aproximadas(6, 6)
+        
+        assert set(aproximada) == set(exata)
+        assert pytest.approx(sum(aproximada.values()), rel=1e-10) == 100.0
+        for soma, prob in exata.items():
+            assert pytest.approx(aproximada[soma], abs=0.5) == prob
+        
+        assert calcular_probabilidades_aproximadas(3, 1) == {3: 100.0}
+
+
+# ============================================
+# TESTES DE COMPARAÇÃO ENTRE EXECUÇÕES
+# ============================================
+
+class TestComparacaoExecucoes:
+    """
+    Testes para AgregadorExecucoes e executar_comparacao().
+    """
+    
+    def test_estatisticas_de_execucoes_conhecidas(self):
+        """
+        Média, variância e faixa devem bater com o cálculo manual.
+        """
+        agregador = AgregadorExecucoes(1, 2)
+        agregador.adicionar(Counter({1: 6, 2: 4}))   # 60% / 40%
+        agregador.adicionar(Counter({1: 40, 2: 60}))  # 40% / 60%
+        
+        assert agregador.num_execucoes == 2
+        assert list(agregador.linha(1)) == [40, 60]
+        
+        resumo = agregador.estatisticas(nivel=0.95)
+        assert [item.soma for item in resumo] == [1, 2]
+        assert pytest.approx(resumo[0].media) == 50.0
+        assert pytest.approx(resumo[0].variancia) == 200.0  # ((10² + 10²) / 1)
+        margem = 1.959964 * math.sqrt(200.0)
+        assert pytest.approx(resumo[0].inferior, rel=1e-5) == 50.0 - margem
+        assert pytest.approx(resumo[0].superior, rel=1e-5) == min(100.0, 50.0 + margem)
+        assert resumo[0].teorica == 50.0
+    
+    def test_execucoes_agrupadas_em_faixas(self):
+        """
+        Com largura > 1 cada coluna acumula uma faixa de somas.
+        """
+        agregador = AgregadorExecucoes(2, 6, largura=4)  # faixas 2-5, 6-9, 10-12
+        agregador.adicionar(Counter({2: 1, 5: 1, 7: 2, 12: 4}))
+        
+        assert list(agregador.linha(0)) == [2, 2, 4]
+        resumo = agregador.estatisticas()
+        assert [item.soma for item in resumo] == [2, 6, 10]
+        assert pytest.approx(sum(item.teorica for item in resumo)) == 100.0
+        assert pytest.approx(resumo[0].teorica) == 10 / 36 * 100
+    
+    def test_divergencias(self):
+        """
+        Uma execução idêntica à teoria tem divergência zero; uma viciada não.
+        """
+        agregador = AgregadorExecucoes(1, 2)
+        agregador.adicionar(Counter({1: 50, 2: 50}))
+        agregador.adicionar(Counter({1: 100}))
+        
+        perfeita, viciada = agregador.divergencias()
+        assert perfeita.kl == 0.0
+        assert perfeita.variacao_total == 0.0
+        assert perfeita.qui_quadrado == 0.0
+        
+        assert pytest.approx(viciada.kl) == math.log(2)
+        assert pytest.approx(viciada.variacao_total) == 0.5
+        assert pytest.approx(viciada.qui_quadrado) == 100.0
+    
+    def test_faixa_contem_a_teoria(self):
+        """
+        Com muitas execuções, a média deve ficar próxima da teoria e a
+        faixa de 95% deve conter a probabilidade teórica.
+        """
+        agregador = executar_comparacao(2, 6, 2000, 200, semente=5)
+        assert agregador.num_execucoes == 200
+        
+        for item in agregador.estatisticas():
+            assert pytest.approx(item.media, abs=0.5) == item.teorica
+            assert item.inferior <= item.teorica <= item.superior
+        
+        # KL médio pequeno: as execuções seguem a distribuição teórica
+        divergencias = agregador.divergencias()
+        assert sum(d.kl for d in divergencias) / len(divergencias) < 0.01
+    
+    def test_contagens_invalidas_devem_falhar(self):
+        """
+        Somas impossíveis, contagens vazias e agregador vazio geram ValueError.
+        """
+        agregador = AgregadorExecucoes(2, 6)
+        with pytest.raises(ValueError):
+            agregador.adicionar(Counter({13: 1}))
+        with pytest.raises(ValueError):
+            agregador.adicionar(Counter())
+        with pytest.raises(ValueError):
+            agregador.estatisticas()
+
+
+# ============================================
+# TESTES DE ARMAZENAMENTO EM DISCO
+# ============================================
+
+class TestTabelasEmDisco:
+    """
+    Testes para gravar_tabelas() e TabelasProbabilidades.
+    Verifica se as tabelas lidas do arquivo mapeado são idênticas às calculadas.
+    """
+    
+    def test_tabelas_identicas_ao_calculo(self, tmp_path):
+        """
+        Grava várias configurações e compara a leitura com o cálculo direto.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        configuracoes = [(1, 6), (2, 6), (3, 6), (1, 20), (4, 4)]
+        assert gravar_tabelas(caminho, configuracoes) == len(configuracoes)
+        
+        with TabelasProbabilidades(caminho) as tabelas:
+            assert len(tabelas) == len(configuracoes)
+            for num_dados, lados in configuracoes:
+                assert (num_dados, lados) in tabelas
+                assert tabelas.como_dicionario(num_dados, lados) == \
+                    calcular_probabilidades(num_dados, lados)
+    
+    def test_obter_retorna_visao_sem_copia(self, tmp_path):
+        """
+        A consulta deve devolver uma memoryview indexada a partir da soma mínima.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        gravar_tabelas(caminho, [(2, 6)])
+        
+        tabelas = TabelasProbabilidades(caminho)
+        prob = tabelas.obter(2, 6)
+        assert isinstance(prob, memoryview)
+        assert len(prob) == 11
+        assert pytest.approx(prob[7 - tabelas.soma_minima(2, 6)], rel=1e-2) == 16.67
+        
+        prob.release()
+        tabelas.fechar()
+    
+    def test_configuracao_ausente_gera_keyerror(self, tmp_path):
+        """
+        Configurações que não estão no arquivo devem gerar KeyError.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        gravar_tabelas(caminho, [(2, 6)])
+        
+        with TabelasProbabilidades(caminho) as tabelas:
+            with pytest.raises(KeyError):
+                tabelas.obter(3, 6)
+    
+    def test_arquivo_invalido_deve_falhar(self, tmp_path):
+        """
+        Arquivos que não estão no formato esperado devem gerar ValueError.
+        """
+        caminho = tmp_path / "invalido.bin"
+        caminho.write_bytes(b"nao e uma tabela de probabilidades")
+        
+        with pytest.raises(ValueError):
+            TabelasProbabilidades(caminho)
+    
+    def test_arquivo_com_bytes_sobrando_deve_falhar(self, tmp_path):
+        """
+        Bytes a mais no fim do arquivo devem gerar ValueError (não TypeError),
+        para que o pacote de aquecimento caia no cálculo na hora.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        gravar_tabelas(caminho, [(2, 6)])
+        with open(caminho, "ab") as arquivo:
+            arquivo.write(b"xyz")
+        
+        with pytest.raises(ValueError):
+            TabelasProbabilidades(caminho)
+        
+        pacote = PacoteAquecimento(caminho)
+        assert (2, 6) not in pacote
+        assert pacote.probabilidades(2, 6) == calcular_probabilidades(2, 6)
+    
+    def test_fechar_com_visao_em_uso_mantem_leitor_valido(self, tmp_path):
+        """
+        Se fechar() falhar por ainda haver memoryviews em uso, o leitor
+        deve continuar devolvendo os valores corretos.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        gravar_tabelas(caminho, [(2, 6)])
+        
+        tabelas = TabelasProbabilidades(caminho)
+        prob = tabelas.obter(2, 6)
+        with pytest.raises(BufferError):
+            tabelas.fechar()
+        
+        assert list(tabelas.obter(2, 6)) == list(calcular_probabilidades(2, 6).values())
+        
+        prob.release()
+        tabelas.fechar()
+        with pytest.raises(ValueError):
+            tabelas.obter(2, 6)
+
+
+# ============================================
+# TESTES DO PACOTE DE AQUECIMENTO
+# ============================================
+
+class TestPacoteAquecimento:
+    """
+    Testes para gerar_pacote() e PacoteAquecimento.
+    """
+    
+    def test_pacote_igual_ao_calculo(self, tmp_path):
+        """
+        As configurações do pacote devem ser idênticas ao cálculo direto.
+        """
+        caminho = tmp_path / "pacote.bin"
+        assert gerar_pacote(caminho, [(2, 6), (3, 6)]) == 2
+        
+        pacote = PacoteAquecimento(caminho)
+        assert (2, 6) in pacote
+        assert (1, 20) not in pacote
+        assert pacote.probabilidades(2, 6) == calcular_probabilidades(2, 6)
+        # Fora do pacote: calcula na hora
+        assert pacote.probabilidades(1, 20) == calcular_probabilidades(1, 20)
+    
+    def test_pacote_aberto_apenas_no_primeiro_uso(self, tmp_path):
+        """
+        Criar o PacoteAquecimento não deve abrir o arquivo.
+        """
+        caminho = tmp_path / "pacote.bin"
+        pacote = PacoteAquecimento(caminho)
+        
+        # O arquivo é gerado depois: só é lido na primeira consulta
+        gerar_pacote(caminho, [(2, 6)])
+        assert (2, 6) in pacote
+    
+    def test_pacote_inexistente_calcula_na_hora(self, tmp_path):
+        """
+        Sem o arquivo do pacote, tudo deve ser calculado normalmente.
+        """
+        pacote = PacoteAquecimento(tmp_path / "nao_existe.bin")
+        assert (2, 6) not in pacote
+        assert pacote.probabilidades(2, 6) == calcular_probabilidades(2, 6)
+    
+    @pytest.mark.parametrize("num_dados,lados,percentual,esperado", [
+        (2, 6, 0, 2), (2, 6, 2.7, 2), (2, 6, 50, 7), (2, 6, 58.4, 8), (2, 6, 100, 12),
+        # Fronteiras exatas: a acumulada não pode passar do valor por arredondamento
+        (1, 6, 50, 3), (1, 6, 50.1, 4), (1, 6, 100, 6),
+        (1, 4, 25, 1), (1, 4, 50, 2), (1, 4, 75, 3),
+    ])
+    def test_percentil_com_e_sem_pacote(self, tmp_path, num_dados, lados, percentual, esperado):
+        """
+        O percentil deve ser o mesmo usando o pacote ou calculando na hora.
+        """
+        caminho = tmp_path / "pacote.bin"
+        gerar_pacote(caminho, [(num_dados, lados)])
+        
+        assert PacoteAquecimento(caminho).percentil(num_dados, lados, percentual) == esperado
+        assert PacoteAquecimento(tmp_path / "vazio.bin").percentil(num_dados, lados, percentual) == esperado
+    
+    def test_acumuladas_exigem_flag(self, tmp_path):
+        """
+        Arquivos gravados sem acumuladas devem recusar a consulta.
+        """
+        caminho = tmp_path / "tabelas.bin"
+        gravar_tabelas(caminho, [(2, 6)])
+        
+        with TabelasProbabilidades(caminho) as tabelas:
+            with pytest.raises(ValueError):
+                tabelas.acumuladas(2, 6)
+
+
 # ============================================
 # CONFIGURAÇÃO DE MARCADORES
 # ============================================